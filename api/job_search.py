@@ -1,32 +1,68 @@
+from typing import Literal, Optional
 from fastapi import APIRouter, Query, HTTPException, Depends
 from services.job_scraper import LinkedINJobScraper
+from services.job_search_cache import job_search_cache, make_search_key
+from services.local_job_search import search_local_jobs, InvalidCursor
+from database import get_jobs_collection
 from auth.dependencies import get_current_user
 import asyncio
 import logging
 from datetime import datetime
 
 router = APIRouter()
-scraper = LinkedINJobScraper()
 logger = logging.getLogger(__name__)
+_scraper = None
+
+
+def get_scraper() -> LinkedINJobScraper:
+    """Scraper singleton, built on the first job search instead of at import"""
+    global _scraper
+    if _scraper is None:
+        _scraper = LinkedINJobScraper()
+    return _scraper
+
 
 @router.get("/jobs")
 async def search_jobs(
     role: str = Query(..., min_length=2, example="python developer"),
     max_results: int = Query(50, ge=1, le=200),
     location: str = Query("India", description="Job location"),
-    current_user_email: str = Depends(get_current_user)  # Still required for auth
+    mode: Literal["scrape", "local"] = Query("scrape", description="local answers from stored jobs and refreshes them in the background"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous local page"),
+    current_user_email: str = Depends(get_current_user),  # Still required for auth
+    scraper: LinkedINJobScraper = Depends(get_scraper),
+    jobs=Depends(get_jobs_collection)
 ):
     try:
-        logger.info(f"Job search for {role} in {location}")
+        logger.info(f"Job search for {role} in {location} ({mode})")
         
         if not role.strip():
             raise HTTPException(status_code=400, detail="Role cannot be empty")
+
+        key = make_search_key(role, location, max_results)
+        scrape = lambda: scraper.scrape_all_jobs(role, max_results, location)
+
+        if mode == "local":
+            try:
+                page = await search_local_jobs(jobs, role, location, max_results, cursor)
+            except InvalidCursor as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return {
+                "status": "success",
+                "role": role,
+                "location": location,
+                "total_results": len(page["jobs"]),
+                "jobs": page["jobs"],
+                "next_cursor": page["next_cursor"],
+                # Scraping stays off the request path; it only tops up the collection.
+                "refreshing": job_search_cache.revalidate(key, scrape),
+                "timestamp": datetime.now()
+            }
         
-        await asyncio.sleep(2)  # Rate limiting
-        
+        # Cached results come back immediately; scrapes are coalesced and paced by the scraper itself.
         try:
-            results = await asyncio.wait_for(
-                scraper.scrape_all_jobs(role, max_results),
+            results, cache_state = await asyncio.wait_for(
+                job_search_cache.get(key, scrape),
                 timeout=300
             )
         except asyncio.TimeoutError:
@@ -44,6 +80,7 @@ async def search_jobs(
             "location": location,
             "total_results": results["total_results"],
             "jobs": results["jobs"],
+            "cache": cache_state,
             "timestamp": datetime.now()
         }
         
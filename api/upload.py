@@ -1,13 +1,18 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Form
-from services.file_service import validate_and_save_file
+from typing import List
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Form, Query
+from services.file_service import validate_and_save_file, save_batch_files
 from auth.dependencies import get_current_user
-from database import resumes_collection  # MongoDB collection
 from datetime import datetime
-from services.pdf_parser_service import extract_clean_text_from_pdf
-from services.docx_parser_service import extract_clean_text_from_docx
-from services.ollama_llm import build_resume_prompt, call_mistral
+from services.resume_pipeline import ResumeParseError, is_parseable, parse_resume, stream_resume_parse
+from services.parse_jobs import parse_job_workers, create_job, get_job, serialize_job
+from services.parse_cache import parse_cache
+from services.batch_service import parse_batch
+from database import get_resumes_collection
+from services.resume_store import upsert_resume, upsert_resumes, stored_parse, save_parse_result
+from services.llm_client import LLMError, LLMUnavailable, LLM_BREAKER_RESET_SECONDS
+from services.worker_pool import run_in_thread, get_stage, StageFull
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
-from fastapi.responses import JSONResponse
 
 
 router = APIRouter()
@@ -16,51 +21,82 @@ def log_upload(user_email: str, filename: str):
     upload_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
     print(f"[UPLOAD LOG] User: {user_email}, File: {filename}, Time: {upload_time}")
 
-@router.post("/api/resume/upload", tags=["Resume Upload"])
-async def upload_resume(
-    file: UploadFile = File(...),
-    email_id: str = Form(...),
-    current_user_email: str = Depends(get_current_user)
-):
+async def save_resume_upload(file: UploadFile, email_id: str, current_user_email: str, resumes):
+    """Validate and store an upload; returns (file_path, file_hash, resume_id, stored_parse).
 
+    stored_parse is the parse already attached to this user's record for the same
+    bytes, model and prompt version, or None.
+    """
     if email_id != current_user_email:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Email in token does not match!")
 
-    success, msg, file_path = validate_and_save_file(file, email_id)
+    # Reject before anything touches disk or MongoDB.
+    if not is_parseable(file.filename):
+        raise HTTPException(status_code=400, detail="Unsupported file format for parsing.")
+
+    success, msg, file_path, file_hash = await run_in_thread("io", validate_and_save_file, file, email_id)
 
     if not success:
         raise HTTPException(status_code=400, detail=msg)
 
-    if file.filename.lower().endswith(".pdf"):
-        extracted_text = extract_clean_text_from_pdf(file_path)
-    elif file.filename.lower().endswith(".docx"):
-        extracted_text = extract_clean_text_from_docx(file_path)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file format for parsing.")
-
     log_upload(current_user_email, file.filename)
 
-    # Save metadata in MongoDB
-    resume_doc = {
-        "user_email": current_user_email,
-        "filename": file.filename,
-        "file_path": file_path,
-        "uploaded_at": datetime.utcnow()
-    }
-    insert_result = resumes_collection.insert_one(resume_doc)
-    if not insert_result.inserted_id:
+    # One record per user and file hash, written once.
+    resume = await upsert_resume(resumes, current_user_email, file.filename, file_path, file_hash)
+    if resume is None:
         raise HTTPException(status_code=500, detail="Failed to save resume metadata")
 
-    prompt = build_resume_prompt(extracted_text)
-    print(f"EXTRACTED TEXT: {extracted_text}")
+    return file_path, file_hash, resume["_id"], stored_parse(resume, file_hash)
+
+@router.post("/api/resume/upload", tags=["Resume Upload"])
+async def upload_resume(
+    file: UploadFile = File(...),
+    email_id: str = Form(...),
+    async_mode: bool = Query(False, alias="async", description="Queue the parse and return a job id"),
+    current_user_email: str = Depends(get_current_user),
+    resumes=Depends(get_resumes_collection)
+):
+    file_path, file_hash, resume_id, parsed_output = await save_resume_upload(file, email_id, current_user_email, resumes)
+
+    if parsed_output is not None and not async_mode:
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "message": "File uploaded and parsed successfully",
+                "Data": parsed_output
+            }
+        )
+
+    if async_mode:
+        job_id = await create_job(resume_id, current_user_email, file.filename, file_path, file_hash)
+        parse_job_workers.notify()
+        return JSONResponse(
+            status_code=202,
+            content={
+                "status": "queued",
+                "message": "File uploaded and queued for parsing",
+                "job_id": job_id,
+                "status_url": f"/api/resume/jobs/{job_id}"
+            }
+        )
 
     try:
-        structured_json = call_mistral(prompt)
-        parsed_output = json.loads(structured_json)  # ensure valid JSON
+        parsed_output = await parse_resume(file_path, file.filename, file_hash=file_hash)
+        await save_parse_result(resumes, current_user_email, file_hash, parsed_output)
+    except HTTPException:
+        raise
+    except LLMUnavailable as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "error", "message": str(e)},
+            headers={"Retry-After": str(int(LLM_BREAKER_RESET_SECONDS))}
+        )
     except Exception as e:
+        message = str(e) if isinstance(e, (ResumeParseError, LLMError)) else f"LLM parsing failed: {str(e)}"
         return JSONResponse(
             status_code=500,
-            content={"status": "error", "message": f"LLM parsing failed: {str(e)}"}
+            content={"status": "error", "message": message}
         )
 
     return JSONResponse(
@@ -73,3 +109,93 @@ async def upload_resume(
     )
 
 
+@router.post("/api/resume/upload/batch", tags=["Resume Upload"])
+async def upload_resume_batch(
+    files: List[UploadFile] = File(..., description="Resume files and/or ZIP archives of resumes"),
+    email_id: str = Form(...),
+    current_user_email: str = Depends(get_current_user),
+    resumes=Depends(get_resumes_collection)
+):
+    """Parse many resumes in one request; results stream back as NDJSON, one line per file"""
+    if email_id != current_user_email:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Email in token does not match!")
+
+    entries = await run_in_thread("io", save_batch_files, files, email_id, accept=is_parseable)
+
+    saved = [entry for entry in entries if not entry.get("error")]
+    resume_ids = await upsert_resumes(resumes, current_user_email, saved)
+    for entry in saved:
+        entry["resume_id"] = str(resume_ids[entry["file_hash"]])
+    log_upload(current_user_email, f"batch of {len(saved)} files")
+
+    async def result_lines():
+        succeeded = 0
+        async for result in parse_batch(entries, resumes, current_user_email):
+            succeeded += result["status"] == "success"
+            yield json.dumps(result) + "\n"
+        yield json.dumps({
+            "status": "complete",
+            "total": len(entries),
+            "succeeded": succeeded,
+            "failed": len(entries) - succeeded
+        }) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/api/resume/parse/stream", tags=["Resume Upload"])
+async def stream_resume_parse_events(
+    file: UploadFile = File(...),
+    email_id: str = Form(...),
+    current_user_email: str = Depends(get_current_user),
+    resumes=Depends(get_resumes_collection)
+):
+    if get_stage("llm").is_full:
+        raise StageFull("llm")
+
+    file_path, file_hash, _, _ = await save_resume_upload(file, email_id, current_user_email, resumes)
+
+    async def event_stream():
+        try:
+            async for event, data in stream_resume_parse(file_path, file.filename, file_hash):
+                if event == "done":
+                    await save_parse_result(resumes, current_user_email, file_hash, data["data"])
+                yield format_sse(event, data)
+        except Exception as e:
+            # Headers are already sent, so failures are reported in-band.
+            yield format_sse("error", {"message": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/api/resume/cache/stats", tags=["Resume Upload"])
+async def get_parse_cache_stats(current_user_email: str = Depends(get_current_user)):
+    return parse_cache.stats()
+
+
+@router.get("/api/resume/jobs/{job_id}", tags=["Resume Upload"])
+async def get_parse_job(job_id: str, current_user_email: str = Depends(get_current_user)):
+    job = await get_job(job_id, current_user_email)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return serialize_job(job)
+
+
+@router.get("/api/resume/jobs/{job_id}/wait", tags=["Resume Upload"])
+async def wait_for_parse_job(
+    job_id: str,
+    timeout: float = Query(30, ge=0, le=60, description="Seconds to wait for the job to finish"),
+    current_user_email: str = Depends(get_current_user)
+):
+    job = await parse_job_workers.wait_for_job(job_id, current_user_email, timeout)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return serialize_job(job)
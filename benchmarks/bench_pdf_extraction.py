@@ -0,0 +1,74 @@
+"""Compare serial and page-sharded PDF text extraction on synthetic documents.
+
+Usage: python -m benchmarks.bench_pdf_extraction [--pages 20 60 120] [--workers 4] [--mode layout]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pymupdf
+from services.pdf_parser_service import (
+    extract_clean_text_from_pdf, shard_page_ranges, PAGE_EXTRACTORS, PDF_EXTRACTION_MODE
+)
+
+LINES_PER_PAGE = 45
+
+
+def make_synthetic_pdf(path: str, pages: int):
+    doc = pymupdf.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 50
+        for line in range(LINES_PER_PAGE):
+            page.insert_text(
+                (50, y),
+                f"Page {page_num + 1} line {line + 1}: Designed and shipped backend services in Python, Go and SQL.",
+                fontsize=9,
+            )
+            y += 16
+    doc.save(path)
+    doc.close()
+
+
+def extract_sharded(path: str, page_count: int, executor: ProcessPoolExecutor, workers: int, mode: str) -> str:
+    extract_pages, finish = PAGE_EXTRACTORS[mode]
+    shards = shard_page_ranges(page_count, workers)
+    futures = [executor.submit(extract_pages, path, start, stop) for start, stop in shards]
+    return finish([page for future in futures for page in future.result()])
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 30, 60, 120])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=sorted(PAGE_EXTRACTORS), default=PDF_EXTRACTION_MODE)
+    args = parser.parse_args()
+
+    print(f"mode={args.mode} workers={args.workers}")
+    print(f"{'pages':>6} {'serial (s)':>11} {'sharded (s)':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(max_workers=args.workers) as executor:
+        executor.submit(len, "").result()  # start workers outside the timed section
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}.pdf")
+            make_synthetic_pdf(path, pages)
+            serial_time, serial_text = timed(lambda: extract_clean_text_from_pdf(path, args.mode), args.repeat)
+            sharded_time, sharded_text = timed(
+                lambda: extract_sharded(path, pages, executor, args.workers, args.mode), args.repeat
+            )
+            assert serial_text == sharded_text, "sharded extraction changed the output"
+            print(f"{pages:>6} {serial_time:>11.3f} {sharded_time:>12.3f} {serial_time / sharded_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Drive concurrent API requests in-process and measure event-loop latency while they run.
+
+A probe task sleeps for a fixed interval in a loop; any extra delay before it wakes up
+is time the loop spent blocked (e.g. by a synchronous database call in a handler).
+
+Needs a reachable MongoDB (MONGO_URI). Usage:
+    python -m benchmarks.load_event_loop [--requests 500] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import httpx
+from main import app, lifespan
+from auth.jwt import create_access_token
+
+PROBE_INTERVAL = 0.005
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def probe_loop_lag(samples: list, stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append(loop.time() - start - PROBE_INTERVAL)
+
+
+async def run_load(client: httpx.AsyncClient, total: int, concurrency: int, email: str, password: str):
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    # Login does a user lookup; job status is a plain read scoped to the user.
+    requests = [
+        ("POST", "/auth/token", {"data": {"username": email, "password": password}}),
+        ("GET", f"/api/resume/jobs/{'0' * 24}", {"headers": headers}),
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one(i: int):
+        method, path, kwargs = requests[i % len(requests)]
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start, latencies, statuses
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    email, password = f"load-{uuid.uuid4().hex[:8]}@example.com", "load-test-password"
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+            response = await client.post("/auth/register", json={"email": email, "password": password})
+            response.raise_for_status()
+
+            lag, stop = [], asyncio.Event()
+            probe = asyncio.create_task(probe_loop_lag(lag, stop))
+            elapsed, latencies, statuses = await run_load(client, args.requests, args.concurrency, email, password)
+            stop.set()
+            await probe
+
+    ms = 1000
+    print(f"requests={args.requests} concurrency={args.concurrency} statuses={statuses}")
+    print(f"throughput: {args.requests / elapsed:.1f} req/s")
+    print(f"request latency (ms): p50={percentile(latencies, 50) * ms:.1f} "
+          f"p99={percentile(latencies, 99) * ms:.1f} max={max(latencies) * ms:.1f}")
+    print(f"event-loop lag (ms): mean={statistics.mean(lag) * ms:.2f} p50={percentile(lag, 50) * ms:.2f} "
+          f"p99={percentile(lag, 99) * ms:.2f} max={max(lag) * ms:.2f} samples={len(lag)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,22 +1,151 @@
-from pymongo import MongoClient, ASCENDING
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
 import os
 
+PARSE_CACHE_TTL_SECONDS = int(os.getenv("PARSE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+OCR_CACHE_TTL_SECONDS = int(os.getenv("OCR_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://mongodb:27017")
 MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "resume_parser_db")
 
-client = MongoClient(MONGO_URI)
-db = client[MONGO_DB_NAME]
+# Connection pool, timeouts (milliseconds) and read/write concerns; names follow the MongoDB URI options.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+# How long an operation may wait for a free pooled connection before failing.
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "1")  # a node count or "majority"
+MONGO_JOURNAL = os.getenv("MONGO_JOURNAL", "false").lower() == "true"
+MONGO_READ_CONCERN = os.getenv("MONGO_READ_CONCERN", "local")
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+
+# Index definitions as (collection, keys, options). Bump INDEX_VERSION whenever this list
+# changes so the next deploy re-applies it; otherwise startup only reads the version doc.
+INDEX_VERSION = 4
+INDEXES = [
+    ("jobs", [("url", ASCENDING)], {"unique": True}),
+    ("jobs", [("title", ASCENDING)], {}),
+    ("jobs", [("company", ASCENDING)], {}),
+    ("jobs", [("location", ASCENDING)], {}),
+    # A collection can have only one text index; weights rank title matches over company and description.
+    ("jobs", [("title", "text"), ("company", "text"), ("description", "text")],
+     {"name": "jobs_text", "weights": {"title": 10, "company": 5, "description": 1}}),
+    ("jobs", [("search_locations", ASCENDING)], {}),
+    # One record per upload; concurrent upserts of the same bytes can't both insert.
+    ("resumes", [("user_email", ASCENDING), ("file_hash", ASCENDING)],
+     {"name": "resume_per_upload", "unique": True, "partialFilterExpression": {"file_hash": {"$exists": True}}}),
+    ("parse_jobs", [("status", ASCENDING), ("created_at", ASCENDING)], {}),
+    ("parse_jobs", [("user_email", ASCENDING)], {}),
+    ("parse_cache", [("last_accessed_at", ASCENDING)], {"expireAfterSeconds": PARSE_CACHE_TTL_SECONDS}),
+    ("ocr_cache", [("created_at", ASCENDING)], {"expireAfterSeconds": OCR_CACHE_TTL_SECONDS}),
+]
+# Indexes removed from INDEXES, dropped by the migration before the new ones are created.
+DROPPED_INDEXES = [
+    ("jobs", "description_text_text"),  # text index on a field the scraper never wrote
+    ("resumes", "user_email_1_file_hash_1"),  # non-unique predecessor of resume_per_upload
+]
+
+# Location the scraper searched before jobs were tagged with search_locations.
+LEGACY_JOB_SEARCH_LOCATION = "india"
+
+_client = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Shared client, created on first use so importing this module does no network I/O"""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            MONGO_URI,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            w=int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN,
+            journal=MONGO_JOURNAL,
+            readConcernLevel=MONGO_READ_CONCERN,
+            readPreference=MONGO_READ_PREFERENCE,
+        )
+    return _client
+
+
+def close_database():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+async def ping_database():
+    await get_client().admin.command("ping")
+
+
+async def migrate_indexes() -> bool:
+    """Create INDEXES and backfill untagged jobs once per INDEX_VERSION; returns False when already applied.
+
+    create_index is idempotent, so replicas starting together may both apply it safely.
+    """
+    migrations = get_database().migrations
+    state = await migrations.find_one({"_id": "indexes"})
+    if state and state.get("version", 0) >= INDEX_VERSION:
+        return False
+    existing = {}
+    for collection, name in DROPPED_INDEXES:
+        if collection not in existing:
+            existing[collection] = await get_collection(collection).index_information()
+        if name in existing[collection]:
+            await get_collection(collection).drop_index(name)
+    for collection, keys, options in INDEXES:
+        await get_collection(collection).create_index(keys, **options)
+    # Jobs scraped before search_locations existed all came from the India-only scraper;
+    # tag them so location-filtered local searches find them.
+    await get_collection("jobs").update_many(
+        {"search_locations": {"$exists": False}},
+        {"$set": {"search_locations": [LEGACY_JOB_SEARCH_LOCATION]}},
+    )
+    await migrations.update_one(
+        {"_id": "indexes"},
+        {"$set": {"version": INDEX_VERSION, "applied_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    return True
+
+
+# FastAPI dependencies, so handlers can be pointed at other collections in tests.
+def get_database():
+    return get_client()[MONGO_DB_NAME]
+
+
+def get_collection(name: str):
+    return get_database()[name]
+
+
+def get_users_collection():
+    return get_collection("users")
+
+
+def get_resumes_collection():
+    return get_collection("resumes")
+
+
+def get_jobs_collection():
+    return get_collection("jobs")
+
+
+def get_parse_jobs_collection():
+    return get_collection("parse_jobs")  # Async resume parse jobs
 
-users_collection = db.users        # Users collection
-resumes_collection = db.resumes    # Resumes collection
-jobs_collection = db.jobs
 
-# Create indexes for faster queries
-jobs_collection.create_index([("url", ASCENDING)], unique=True)
-jobs_collection.create_index([("title", ASCENDING)])
-jobs_collection.create_index([("company", ASCENDING)])
-jobs_collection.create_index([("location", ASCENDING)])
-jobs_collection.create_index([("description_text", "text")])
-      
+def get_parse_cache_collection():
+    return get_collection("parse_cache")  # Cached LLM parses keyed by file hash
 
 
+def get_ocr_cache_collection():
+    return get_collection("ocr_cache")  # OCR text of scanned PDF pages keyed by page hash
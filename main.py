@@ -1,9 +1,97 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from api import upload, auth, job_search
+from services.file_service import MAX_UPLOAD_BYTES, MAX_BATCH_UPLOAD_BYTES
+from services.worker_pool import shutdown_pools
+from services.parse_jobs import parse_job_workers
+from services.llm_client import close_llm_client
+from services.page_fetcher import close_page_fetcher
+from services.browser_pool import get_browser_pool, close_browser_pool
+from database import migrate_indexes, ping_database, close_database
+
+# uvicorn only configures its own loggers; without this the app's INFO reports
+# (startup timings, prompt compaction sizes) are dropped.
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each phase is timed and logged together, so a slow boot points at its cause.
+    timings = {"imports": IMPORT_SECONDS}
+
+    started = time.perf_counter()
+    try:
+        await ping_database()
+    except Exception as e:
+        logger.error(f"MongoDB ping failed at startup: {e}")
+    timings["mongo_ping"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        applied = await migrate_indexes()
+        logger.info("Index migration applied" if applied else "Indexes already up to date")
+    except Exception as e:
+        logger.error(f"Index migration failed: {e}")
+    timings["index_migration"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parse_job_workers.start()
+    timings["parse_job_workers"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        await get_browser_pool().start()
+    except Exception as e:
+        # Searches retry the launch on first checkout.
+        logger.error(f"Browser pool failed to start: {e}")
+    timings["browser_pool"] = time.perf_counter() - started
+
+    app.state.startup_timings = timings
+    logger.info("Startup timings: " + ", ".join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in timings.items()))
+    yield
+    await parse_job_workers.stop()
+    await close_llm_client()
+    await close_page_fetcher()
+    await close_browser_pool()
+    shutdown_pools()
+    close_database()
+
+
+app = FastAPI(title="Resume Parser API", lifespan=lifespan)
+
+# Allowance for multipart boundaries and form fields around the file itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_SIZE_LIMITS = {
+    "/api/resume/upload": MAX_UPLOAD_BYTES,
+    "/api/resume/parse/stream": MAX_UPLOAD_BYTES,
+    "/api/resume/upload/batch": MAX_BATCH_UPLOAD_BYTES,
+}
+
 
-app = FastAPI(title="Resume Parser API")
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    # Refuse declared-oversize uploads before the multipart body is spooled.
+    limit = UPLOAD_SIZE_LIMITS.get(request.url.path)
+    if limit is not None:
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and \
+                int(content_length) > limit + MULTIPART_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": "File too large!"})
+    return await call_next(request)
 
 
 app.include_router(auth.router)
 app.include_router(upload.router)
-app.include_router(job_search.router)
\ No newline at end of file
+app.include_router(job_search.router)
@@ -0,0 +1,106 @@
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+def _to_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value if item is not None)
+    return str(value)
+
+
+def _to_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    if isinstance(value, dict):
+        return [value]
+    return value
+
+
+def _to_entries(value, text_field: str) -> list:
+    """Object list for education/experience; bare strings become {text_field: string}"""
+    if isinstance(value, str):
+        value = [value]  # one free-text entry, not a comma-separated list
+    entries = []
+    for item in _to_list(value):
+        if isinstance(item, dict):
+            entries.append(item)
+        elif item is not None and _to_text(item).strip():
+            entries.append({text_field: _to_text(item).strip()})
+    return entries
+
+
+class Education(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    degree: Optional[str] = None
+    institution: Optional[str] = None
+    year: Optional[str] = None
+
+    @field_validator("degree", "institution", "year", mode="before")
+    @classmethod
+    def coerce_text(cls, value):
+        return _to_text(value)
+
+
+class Experience(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    job_title: Optional[str] = None
+    company: Optional[str] = None
+    years: Optional[str] = None
+
+    @field_validator("job_title", "company", "years", mode="before")
+    @classmethod
+    def coerce_text(cls, value):
+        return _to_text(value)
+
+
+class ParsedResume(BaseModel):
+    """Structured resume as returned by /api/resume/upload"""
+
+    model_config = ConfigDict(extra="allow")
+
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: List[str] = []
+    education: List[Education] = []
+    experience: List[Experience] = []
+    role: List[str] = []
+
+    @field_validator("name", "email", "phone", mode="before")
+    @classmethod
+    def coerce_text(cls, value):
+        return _to_text(value)
+
+    @field_validator("education", mode="before")
+    @classmethod
+    def coerce_education(cls, value):
+        return _to_entries(value, "degree")
+
+    @field_validator("experience", mode="before")
+    @classmethod
+    def coerce_experience(cls, value):
+        return _to_entries(value, "job_title")
+
+    @field_validator("skills", "role", mode="before")
+    @classmethod
+    def coerce_items(cls, value):
+        return [_to_text(item) for item in _to_list(value) if item is not None]
+
+
+def resume_json_schema(fields=None) -> dict:
+    """JSON schema for ParsedResume, optionally limited to some top-level fields"""
+    schema = ParsedResume.model_json_schema()
+    if fields is not None:
+        schema["properties"] = {name: spec for name, spec in schema["properties"].items() if name in fields}
+    schema["required"] = list(schema["properties"])
+    schema.pop("title", None)
+    schema.pop("description", None)
+    return schema
@@ -0,0 +1,50 @@
+import asyncio
+import os
+import logging
+from services.resume_pipeline import parse_resume
+from services.resume_store import save_parse_result
+from services.worker_pool import StageFull, RETRY_AFTER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_BUSY_RETRIES = int(os.getenv("BATCH_BUSY_RETRIES", "5"))
+
+
+async def _parse_entry(index: int, entry: dict, resumes, user_email: str, semaphore: asyncio.Semaphore) -> dict:
+    result = {"index": index, "filename": entry["filename"]}
+    if entry.get("error"):
+        result.update({"status": "error", "message": entry["error"]})
+        return result
+
+    async with semaphore:
+        for attempt in range(BATCH_BUSY_RETRIES + 1):
+            try:
+                data = await parse_resume(entry["file_path"], entry["filename"], file_hash=entry["file_hash"])
+                await save_parse_result(resumes, user_email, entry["file_hash"], data)
+                result.update({"status": "success", "resume_id": entry.get("resume_id"), "data": data})
+                return result
+            except StageFull:
+                # Batch items wait for capacity instead of failing like interactive uploads.
+                if attempt == BATCH_BUSY_RETRIES:
+                    result.update({"status": "error", "message": "Server is busy. Please retry later."})
+                    return result
+                await asyncio.sleep(RETRY_AFTER_SECONDS)
+            except Exception as e:
+                logger.error(f"Batch parse failed for {entry['filename']}: {str(e)}")
+                result.update({"status": "error", "message": str(e)})
+                return result
+
+
+async def parse_batch(entries: list, resumes, user_email: str, concurrency: int = BATCH_CONCURRENCY):
+    """Parse saved batch entries concurrently, storing each result on the user's resume record
+    and yielding it as it completes"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [asyncio.create_task(_parse_entry(i, entry, resumes, user_email, semaphore)) for i, entry in enumerate(entries)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away: stop scheduling work for the remaining files.
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import logging
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from services.user_agents import random_user_agent
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))  # warm contexts
+BROWSER_CONTEXT_MAX_USES = int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20"))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "4"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+BROWSER_LOCALE = os.getenv("BROWSER_LOCALE", "en-IN")
+BROWSER_TIMEZONE = os.getenv("BROWSER_TIMEZONE", "Asia/Kolkata")
+
+
+class _PooledContext:
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+        self.uses = 0
+        self.crashed = False
+
+
+class BrowserPool:
+    """One long-lived Chromium with a pool of warm contexts.
+
+    Each context gets a random user agent when created. A context is replaced after
+    BROWSER_CONTEXT_MAX_USES checkouts, when one of its pages crashes, or when the
+    checkout raised anything other than a timeout. If the browser itself disconnects it
+    is relaunched and the pooled contexts are rebuilt as they are checked out.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_CONTEXT_MAX_USES,
+        max_pages: int = BROWSER_MAX_PAGES,
+    ):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._pages = asyncio.Semaphore(max(1, max_pages))
+        self._idle = asyncio.Queue()
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._started = False
+
+    async def start(self):
+        async with self._lock:
+            if self._started:
+                return
+            self._playwright = await async_playwright().start()
+            try:
+                await self._launch()
+                for _ in range(self.size):
+                    self._idle.put_nowait(await self._new_context())
+            except Exception:
+                await self._shutdown()
+                raise
+            self._started = True
+            logger.info(f"Browser pool started with {self.size} contexts")
+
+    async def _launch(self):
+        self._browser = await self._playwright.chromium.launch(headless=BROWSER_HEADLESS)
+
+    async def _new_context(self) -> _PooledContext:
+        if not self._browser.is_connected():
+            logger.warning("Browser disconnected, relaunching")
+            await self._launch()
+        context = await self._browser.new_context(
+            user_agent=random_user_agent(),
+            locale=BROWSER_LOCALE,
+            timezone_id=BROWSER_TIMEZONE,
+        )
+        return _PooledContext(self._browser, context)
+
+    async def _recycle(self, pooled: _PooledContext) -> _PooledContext:
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass  # already gone with a crashed or relaunched browser
+        async with self._lock:
+            return await self._new_context()
+
+    def _is_usable(self, pooled: _PooledContext) -> bool:
+        return not pooled.crashed and pooled.uses < self.max_uses and \
+            pooled.browser is self._browser and pooled.browser.is_connected()
+
+    @asynccontextmanager
+    async def checkout(self):
+        """Borrow a warm browser context; waits while all of them are in use"""
+        if not self._started:
+            await self.start()
+        pooled = await self._idle.get()
+        try:
+            if not self._is_usable(pooled):
+                pooled = await self._recycle(pooled)
+            pooled.uses += 1
+            yield pooled
+        except PlaywrightTimeoutError:
+            raise
+        except Exception:
+            pooled.crashed = True
+            raise
+        finally:
+            if not self._is_usable(pooled):
+                try:
+                    pooled = await self._recycle(pooled)
+                except Exception as e:
+                    logger.error(f"Could not replace browser context: {e}")
+            self._idle.put_nowait(pooled)
+
+    @asynccontextmanager
+    async def open_page(self, pooled: _PooledContext):
+        """Open a page in a checked-out context, capped at BROWSER_MAX_PAGES across the pool"""
+        async with self._pages:
+            page = await pooled.context.new_page()
+            page.on("crash", lambda _: setattr(pooled, "crashed", True))
+            try:
+                yield page
+            finally:
+                if not page.is_closed():
+                    await page.close()
+
+    async def stop(self):
+        async with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            await self._shutdown()
+            logger.info("Browser pool stopped")
+
+    async def _shutdown(self):
+        while not self._idle.empty():
+            try:
+                await self._idle.get_nowait().context.close()
+            except Exception:
+                pass
+        if self._browser is not None:
+            await self._browser.close()
+        await self._playwright.stop()
+        self._browser = self._playwright = None
+
+
+_browser_pool = None
+
+
+def get_browser_pool() -> BrowserPool:
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
+
+
+async def close_browser_pool():
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.stop()
+        _browser_pool = None
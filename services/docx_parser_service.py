@@ -1,34 +1,75 @@
-from docx import Document
-import docx2txt
+import logging
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from services.text_normalizer import normalize_text
 
-def extract_clean_text_from_docx(file_path: str) -> str:
-    def extract_with_python_docx(path: str) -> str:
-        try:
-            doc = Document(path)
-            lines = []
-            for para in doc.paragraphs:
-                text = para.text.strip()
+logger = logging.getLogger(__name__)
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+W_P, W_T, W_TAB, W_BR, W_CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+# Subtrees whose text must not be read: VML copies of DrawingML textboxes and
+# tab-stop definitions (w:tabs/w:tab) in paragraph properties.
+SKIPPED_TAGS = {MC + "Fallback", W + "tabs"}
+HEADER_PART_RE = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PART_RE = re.compile(r"^word/footer\d*\.xml$")
+DOCUMENT_PART = "word/document.xml"
+
+
+def _iter_paragraphs(stream):
+    """Yield paragraph texts of one WordprocessingML part in document order.
+
+    Table cells and textboxes are made of ordinary w:p elements, so they come
+    out in place. A textbox anchored inside a paragraph is emitted before the
+    paragraph that holds it, via the stack of open paragraphs.
+    """
+    paragraphs = []
+    skip_depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if tag in SKIPPED_TAGS:
+            skip_depth += 1 if event == "start" else -1
+        elif skip_depth:
+            pass
+        elif event == "start":
+            if tag == W_P:
+                paragraphs.append([])
+            continue
+        elif paragraphs:
+            if tag == W_T:
+                paragraphs[-1].append(elem.text or "")
+            elif tag == W_TAB:
+                paragraphs[-1].append("\t")
+            elif tag in (W_BR, W_CR):
+                paragraphs[-1].append("\n")
+            elif tag == W_P:
+                text = "".join(paragraphs.pop()).strip()
                 if text:
-                    lines.append(text)
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        clean = cell.text.strip().replace("\n", " ")
-                        if clean:
-                            row_text.append(clean)
-                    lines.extend(row_text)
-            return "\n".join(lines).strip()
-        except Exception:
-            return ""
+                    yield text
+        if event == "end":
+            elem.clear()
 
-    def extract_with_docx2txt(path: str) -> str:
-        try:
-            return docx2txt.process(path).strip()
-        except:
-            return ""
 
-    text = extract_with_python_docx(file_path)
-    if len(text.split()) < 30:
-        return extract_with_docx2txt(file_path)
-    return text
+def extract_clean_text_from_docx(file_path: str) -> str:
+    """Headers, body (paragraphs, tables, textboxes) and footers of a DOCX, read from one open zip"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = archive.namelist()
+            headers = sorted(name for name in names if HEADER_PART_RE.match(name))
+            footers = sorted(name for name in names if FOOTER_PART_RE.match(name))
+            lines = []
+            seen_margin_text = set()
+            for part in headers + [DOCUMENT_PART] + footers:
+                with archive.open(part) as stream:
+                    for text in _iter_paragraphs(stream):
+                        if part != DOCUMENT_PART:
+                            # First-page, even and default headers often repeat the same text.
+                            if text in seen_margin_text:
+                                continue
+                            seen_margin_text.add(text)
+                        lines.append(text)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        logger.warning(f"Could not read DOCX {file_path}: {str(e)}")
+        return ""
+    return normalize_text("\n".join(lines))
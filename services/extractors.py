@@ -0,0 +1,112 @@
+import codecs
+import os
+import re
+from services.pdf_parser_service import extract_clean_text_from_pdf
+from services.docx_parser_service import extract_clean_text_from_docx
+from services.text_normalizer import normalize_text
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TEXT = "text/plain"
+MARKDOWN = "text/markdown"
+
+# Leading bytes of binary formats; text formats only need to look like text.
+MAGIC_BYTES = {
+    PDF: b"%PDF-",
+    DOCX: b"PK\x03\x04",  # DOCX is a ZIP container
+}
+TEXT_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Used when the start of a text file is not valid UTF-8.
+FALLBACK_TEXT_ENCODING = "cp1252"
+TEXT_READ_CHUNK = 64 * 1024
+
+MARKDOWN_RULES = [
+    (re.compile(r"^\s{0,3}(```|~~~).*$"), ""),  # code fences
+    (re.compile(r"^\s{0,3}([-*_]\s*){3,}$"), ""),  # horizontal rules
+    (re.compile(r"^\s*\|?(\s*:?-{3,}:?\s*\|)+\s*:?-*:?\s*$"), ""),  # table separator rows
+    (re.compile(r"^\s{0,3}#{1,6}\s+(.*?)(\s+#+)?\s*$"), r"\1"),  # ATX headers
+    (re.compile(r"^\s*>\s?"), ""),  # block quotes
+    (re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(\[[ xX]\]\s+)?"), ""),  # list markers and task boxes
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),  # images keep their alt text
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)[^)]*\)"), r"\1 (\2)"),  # links keep the URL for contact extraction
+    (re.compile(r"<(https?://[^>]+|[^@>\s]+@[^>\s]+)>"), r"\1"),  # autolinks
+    (re.compile(r"(\*\*|__|\*|`)(?=\S)(.+?)(?<=\S)\1"), r"\2"),  # emphasis and inline code
+    (re.compile(r"^\s*\||\|\s*$"), ""),  # outer table pipes
+]
+
+
+def sniff_content_type(chunk: bytes, extension: str):
+    """Content type of an upload from its first chunk, or None if it does not match its extension"""
+    content_type = EXTENSION_CONTENT_TYPES.get(extension)
+    if content_type is None or not chunk:
+        return None
+    magic = MAGIC_BYTES.get(content_type)
+    if magic is not None:
+        # PDF readers accept a few bytes of junk before the header.
+        matched = magic in chunk[:1024] if content_type == PDF else chunk.startswith(magic)
+        return content_type if matched else None
+    if detect_text_encoding(chunk) is None:
+        return None
+    return content_type
+
+
+def detect_text_encoding(chunk: bytes):
+    """Guess the encoding of a text file from its first chunk; None if it looks binary"""
+    for bom, encoding in TEXT_BOMS:
+        if chunk.startswith(bom):
+            return encoding
+    if b"\x00" in chunk:
+        return None
+    try:
+        # final=False tolerates a multi-byte character cut off at the chunk boundary.
+        codecs.getincrementaldecoder("utf-8")().decode(chunk, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return FALLBACK_TEXT_ENCODING
+
+
+def _iter_text_lines(file_path: str):
+    with open(file_path, "rb") as raw:
+        encoding = detect_text_encoding(raw.read(TEXT_READ_CHUNK)) or FALLBACK_TEXT_ENCODING
+    # The text layer decodes incrementally; bytes that don't fit the guess are replaced, not fatal.
+    with open(file_path, encoding=encoding, errors="replace") as f:
+        yield from f
+
+
+def extract_clean_text_from_txt(file_path: str) -> str:
+    return normalize_text("".join(_iter_text_lines(file_path)))
+
+
+def _strip_markdown(line: str) -> str:
+    for pattern, replacement in MARKDOWN_RULES:
+        line = pattern.sub(replacement, line)
+    return line
+
+
+def extract_clean_text_from_markdown(file_path: str) -> str:
+    """Markdown as plain text: headers, list markers and emphasis removed, link URLs kept"""
+    return normalize_text("\n".join(_strip_markdown(line.rstrip("\r\n")) for line in _iter_text_lines(file_path)))
+
+
+# content type -> (file extensions, extractor). Extractors take a file path and
+# run in the worker process pool.
+EXTRACTORS = {
+    PDF: ((".pdf",), extract_clean_text_from_pdf),
+    DOCX: ((".docx",), extract_clean_text_from_docx),
+    TEXT: ((".txt",), extract_clean_text_from_txt),
+    MARKDOWN: ((".md", ".markdown"), extract_clean_text_from_markdown),
+}
+EXTENSION_CONTENT_TYPES = {
+    extension: content_type
+    for content_type, (extensions, _) in EXTRACTORS.items()
+    for extension in extensions
+}
+
+
+def content_type_for(filename: str):
+    """Content type for a filename whose contents have already been sniffed, or None if unsupported"""
+    return EXTENSION_CONTENT_TYPES.get(os.path.splitext(filename.lower())[1])
@@ -1,33 +1,163 @@
 import os
+import hashlib
+import uuid
+import zipfile
 from fastapi import UploadFile
-from datetime import datetime
-from database import resumes_collection  # MongoDB collection
+from services.extractors import EXTENSION_CONTENT_TYPES, sniff_content_type
 
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-ALLOWED_EXTENSIONS = (".pdf", ".docx", ".txt", ".md")
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# Total bytes a batch may write to disk after ZIP members are decompressed.
+MAX_BATCH_EXTRACTED_BYTES = int(os.getenv("MAX_BATCH_EXTRACTED_BYTES", str(MAX_BATCH_UPLOAD_BYTES)))
 
-def validate_and_save_file(file: UploadFile, email: str):
-    if not any(file.filename.lower().endswith(ext) for ext in ALLOWED_EXTENSIONS):
-        return False, "Unsupported file type!!", None
+# Only formats with a registered extractor are accepted.
+ALLOWED_EXTENSIONS = tuple(EXTENSION_CONTENT_TYPES)
+
+
+def sniff_first_chunk(chunk: bytes, extension: str) -> bool:
+    """Check that the start of an upload matches its extension"""
+    return sniff_content_type(chunk, extension) is not None
 
-    filename = f"{email.replace('@', '_')}_{file.filename}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
 
+def save_upload_stream(source, destination, extension: str, max_bytes: int = MAX_UPLOAD_BYTES):
+    """Copy a binary stream to disk chunk by chunk, hashing as it goes.
+
+    The first chunk is sniffed before anything is written, and the copy stops as soon
+    as `max_bytes` is exceeded. Data goes to a temporary .part file that is moved onto
+    the destination only once complete, so a failed or oversized upload never touches
+    a file already stored there. `destination` is a path, or a function of the SHA-256
+    hex digest for content-addressed names.
+    Returns (success, message, file_path, sha256_hex).
+    """
+    chunk = source.read(UPLOAD_CHUNK_SIZE)
+    if not sniff_first_chunk(chunk, extension):
+        return False, "File content does not match its extension!!", None, None
+
+    temp_path = os.path.join(UPLOAD_DIR, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
     try:
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
+        with open(temp_path, "wb") as f:
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise OverflowError
+                digest.update(chunk)
+                f.write(chunk)
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+        file_hash = digest.hexdigest()
+        file_path = destination(file_hash) if callable(destination) else destination
+        os.replace(temp_path, file_path)
+    except OverflowError:
+        os.remove(temp_path)
+        return False, f"File too large! Maximum size is {max_bytes / (1024 * 1024):.1f} MB", None, None
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return True, "File saved", file_path, file_hash
 
-        # Insert resume metadata into MongoDB
-        resumes_collection.insert_one({
-            "user_email": email,
-            "filename": file.filename,
-            "file_path": file_path,
-            "uploaded_at": datetime.utcnow()
-        })
 
-        return True, "File saved and metadata stored", file_path
+def content_addressed_path(email: str, filename: str):
+    """Destination for save_upload_stream named by the content hash.
+
+    Different bytes uploaded under the same filename get different paths, so a later
+    upload can never change the file an earlier record, job or cache entry points to.
+    """
+    return lambda file_hash: os.path.join(UPLOAD_DIR, f"{email.replace('@', '_')}_{file_hash[:16]}_{filename}")
+
+
+def validate_and_save_file(file: UploadFile, email: str):
+    extension = os.path.splitext(file.filename.lower())[1]
+    if extension not in ALLOWED_EXTENSIONS:
+        return False, "Unsupported file type!!", None, None
+
+    destination = content_addressed_path(email, os.path.basename(file.filename))
+
+    try:
+        success, msg, file_path, file_hash = save_upload_stream(file.file, destination, extension)
+        if not success:
+            return False, msg, None, None
+
+        # Metadata is written by the caller (services/resume_store.py), once per upload.
+        return True, "File saved", file_path, file_hash
 
     except Exception as e:
-        return False, str(e), None
+        return False, str(e), None, None
+
+
+def iter_batch_entries(files):
+    """Yield (filename, stream, error) per uploaded file, expanding ZIP archives entry by entry.
+
+    Archive members are decompressed lazily as each stream is read, so nothing
+    is extracted to disk beyond the entry currently being saved.
+    """
+    for file in files:
+        if not file.filename.lower().endswith(".zip"):
+            yield os.path.basename(file.filename), file.file, None
+            continue
+        try:
+            archive = zipfile.ZipFile(file.file)
+        except zipfile.BadZipFile:
+            yield file.filename, None, "Invalid ZIP archive"
+            continue
+        with archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                if info.file_size > MAX_UPLOAD_BYTES:
+                    yield name, None, "File too large!"
+                    continue
+                with archive.open(info) as entry:
+                    yield name, entry, None
+
+
+def save_batch_entry(stream, filename: str, email: str, max_bytes: int = MAX_UPLOAD_BYTES):
+    """Save one batch entry under a content-addressed name; returns (success, msg, file_path, file_hash)"""
+    extension = os.path.splitext(filename.lower())[1]
+    if extension not in ALLOWED_EXTENSIONS:
+        return False, "Unsupported file type!!", None, None
+
+    return save_upload_stream(stream, content_addressed_path(email, filename), extension, max_bytes)
+
+
+def save_batch_files(files, email: str, accept=None) -> list:
+    """Save every file (and ZIP member) of a batch upload, one entry at a time.
+
+    `accept` is an optional filename predicate; rejected entries are never written.
+    Saving stops once MAX_BATCH_EXTRACTED_BYTES have been written, so a small archive
+    of highly compressible entries can't fill the disk.
+    """
+    entries = []
+    remaining = MAX_BATCH_EXTRACTED_BYTES
+    for filename, stream, error in iter_batch_entries(files):
+        if len(entries) >= MAX_BATCH_FILES:
+            entries.append({"filename": filename, "error": f"Batch limit of {MAX_BATCH_FILES} files reached"})
+            break
+        if error is None and accept is not None and not accept(filename):
+            error = "Unsupported file format for parsing."
+        if error is None:
+            max_bytes = min(MAX_UPLOAD_BYTES, remaining)
+            try:
+                success, msg, file_path, file_hash = save_batch_entry(stream, filename, email, max_bytes)
+            except Exception as e:
+                success, msg = False, str(e)
+            if success:
+                remaining -= os.path.getsize(file_path)
+            elif max_bytes < MAX_UPLOAD_BYTES and msg.startswith("File too large"):
+                limit_mb = MAX_BATCH_EXTRACTED_BYTES / (1024 * 1024)
+                entries.append({"filename": filename, "error": f"Batch size limit of {limit_mb:.1f} MB reached"})
+                break
+            error = None if success else msg
+        if error:
+            entries.append({"filename": filename, "error": error})
+        else:
+            entries.append({"filename": filename, "file_path": file_path, "file_hash": file_hash})
+    return entries
@@ -1,71 +1,75 @@
 import asyncio
 import random
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin, quote
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
-import requests
+import httpx
 import json
 from datetime import datetime
-from pymongo import MongoClient
-from pathlib import Path
-import os
-from bson import ObjectId
+from pymongo import UpdateOne
+from database import get_jobs_collection
+from services.text_normalizer import normalize_text
+from services.page_fetcher import get_page_fetcher
+from services.job_search_cache import normalize_query
+from services.browser_pool import get_browser_pool
+from services.user_agents import load_user_agents
+
+# Fields returned to API clients; existence checks and re-reads project to these.
+JOB_FIELDS = {field: 1 for field in (
+    "title", "company", "location", "url", "source", "timestamp", "description", "last_updated"
+)}
+
+
+def serialize_job(doc):
+    """Convert MongoDB document to JSON-serializable format"""
+    if not doc:
+        return None
+    doc = dict(doc)
+    doc["_id"] = str(doc["_id"])  # Convert ObjectId to string
+    doc["timestamp"] = doc["timestamp"].isoformat() if "timestamp" in doc else None
+    doc["last_updated"] = doc["last_updated"].isoformat() if "last_updated" in doc else None
+    return doc
+
 
 class LinkedINJobScraper:
-    def __init__(self):
-        self.user_agents = self._load_user_agents()
+    def __init__(self, collection=None, fetcher=None, browsers=None):
         self.jobs_per_page = 25
         self.max_retries = 3
         self.timeout = 60000
-        self.db = self._init_db()
-        self.seen_urls = set()
+        self._collection = collection
+        self._fetcher = fetcher
+        self._browsers = browsers
 
-    def _load_user_agents(self):
-        """Load user agents from file or return defaults"""
-        try:
-            file_path = Path(__file__).parent / "user_agents_list.txt"
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return [line.strip() for line in f if line.strip()]
-        except Exception as e:
-            print(f"User agent load error: {str(e)}")
-        return self._get_default_agents()
-
-    def _get_default_agents(self):
-        """Fallback user agents"""
-        return [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_3) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
-            "Mozilla/5.0 (iPhone; CPU iPhone OS 17_3 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1"
-        ]
-
-    def _init_db(self):
-        client = MongoClient(os.getenv("MONGO_URI", "mongodb://mongodb:27017"))
-        db = client[os.getenv("MONGO_DB_NAME", "resume_parser_db")]
-        db.jobs.create_index([("url", 1)], unique=True)
-        return db.jobs
-
-    async def scrape_linkedin_jobs(self, role, max_results=100):
+    @property
+    def db(self):
+        # Shared async client from database.py, resolved on first use; the unique url index is created there.
+        return self._collection if self._collection is not None else get_jobs_collection()
+
+    @property
+    def fetcher(self):
+        return self._fetcher if self._fetcher is not None else get_page_fetcher()
+
+    @property
+    def user_agents(self):
+        # Read once per process on first use; see services/user_agents.py.
+        return load_user_agents()
+
+    @property
+    def browsers(self):
+        return self._browsers if self._browsers is not None else get_browser_pool()
+
+    async def scrape_linkedin_jobs(self, role, max_results=100, location="India"):
         job_links = set()
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=random.choice(self.user_agents),
-                locale="en-IN",
-                timezone_id="Asia/Kolkata"
-            )
-            
-            page = await context.new_page()
-            
+        # Warm context from the shared pool; it carries its own rotated user agent.
+        async with self.browsers.checkout() as context, self.browsers.open_page(context) as page:
             try:
                 pages_to_scrape = (max_results // self.jobs_per_page) + 2
                 
                 for page_num in range(pages_to_scrape):
                     start = page_num * self.jobs_per_page
                     search_url = (
-                        f"https://www.linkedin.com/jobs/search/?keywords={role.replace(' ', '%20')}"
-                        f"&location=India"
+                        f"https://www.linkedin.com/jobs/search/?keywords={quote(role)}"
+                        f"&location={quote(location)}"
                         f"&start={start}"
                     )
                     
@@ -80,39 +84,28 @@ class LinkedINJobScraper:
                         href = await link.get_attribute("href")
                         if href and "/jobs/view/" in href:
                             full_url = urljoin('https://www.linkedin.com', href.split('?')[0])
-                            if full_url not in self.seen_urls:
-                                job_links.add(full_url)
-                                self.seen_urls.add(full_url)
-                                if len(job_links) >= max_results:
-                                    await browser.close()
-                                    return list(job_links)
+                            job_links.add(full_url)
+                            if len(job_links) >= max_results:
+                                return list(job_links)
                     
                     await asyncio.sleep(random.uniform(2, 4))
                 
             except Exception as e:
                 print(f"Scraping error: {str(e)}")
-            finally:
-                await browser.close()
         
         return list(job_links)[:max_results]
 
     async def get_job_details(self, url):
-        """Fetch job details with duplicate prevention"""
+        """Fetch and parse a job page; storing is left to the caller"""
         try:
-            # Check if job already exists
-            existing_job = self.db.find_one({"url": url})
-            if existing_job:
-                print(f"Job already exists, skipping: {url}")
-                return self._convert_to_json_serializable(existing_job)
-
             headers = {
                 "User-Agent": random.choice(self.user_agents),
                 "Accept-Language": "en-US,en;q=0.9",
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Concurrency and per-host pacing are handled by the shared fetcher.
+            html = await self.fetcher.fetch(url, headers=headers)
+            soup = BeautifulSoup(html, 'html.parser')
             
             job_data = {
                 "title": "No Title",
@@ -146,65 +139,74 @@ class LinkedINJobScraper:
                 if description_div:
                     job_data["description"] = self._clean_text(description_div.get_text())
 
-            # Insert with duplicate protection
-            try:
-                result = self.db.insert_one(job_data)
-                job_data["_id"] = str(result.inserted_id)  # Convert ObjectId to string
-                print(f"New job stored: {url}")
-                return job_data
-            except Exception as e:
-                print(f"Duplicate prevented for {url}: {str(e)}")
-                existing = self.db.find_one({"url": url})
-                return self._convert_to_json_serializable(existing)
+            return job_data
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Request failed for {url}: {str(e)}")
         except Exception as e:
             print(f"Unexpected error processing {url}: {str(e)}")
         return None
 
+    async def _find_existing_jobs(self, urls):
+        """One $in query for the stored jobs among these urls; returns {url: doc}"""
+        if not urls:
+            return {}
+        cursor = self.db.find({"url": {"$in": list(urls)}}, JOB_FIELDS)
+        return {doc["url"]: doc async for doc in cursor}
+
+    async def _store_jobs(self, jobs, location, existing_urls=()):
+        """Upsert freshly scraped jobs in one unordered bulk write and return the stored docs.
+
+        Every job the search surfaced, new or already stored, is tagged with the searched
+        location so local search can filter on it (a job's own location is usually a city).
+        """
+        tag = {"$addToSet": {"search_locations": normalize_query(location)}}
+        # $setOnInsert keeps whatever another search stored first for the same url.
+        operations = [UpdateOne({"url": job["url"]}, {"$setOnInsert": job, **tag}, upsert=True) for job in jobs]
+        operations += [UpdateOne({"url": url}, tag) for url in existing_urls]
+        if not operations:
+            return []
+        await self.db.bulk_write(operations, ordered=False)
+        if not jobs:
+            return []
+        # bulk_write only reports ids of inserted documents; one query covers both cases.
+        stored = await self._find_existing_jobs(job["url"] for job in jobs)
+        print(f"Stored {len(jobs)} new jobs")
+        return [stored[job["url"]] for job in jobs if job["url"] in stored]
+
     def _clean_text(self, text):
         """Convert to clean, formatted text without HTML"""
-        if not text:
-            return ""
-        
-        lines = []
-        for line in text.splitlines():
-            line = line.strip()
-            if line:
-                lines.append(line)
-        
-        text = '\n\n'.join(lines)
-        text = text.replace('\u00a0', ' ')
-        text = text.replace('\u2022', '•')
-        
-        return text
+        return normalize_text(text, separator='\n\n', drop_bullets=False, join_hyphenated=False)
 
     def _convert_to_json_serializable(self, doc):
-        """Convert MongoDB document to JSON-serializable format"""
-        if not doc:
-            return None
-        doc = dict(doc)
-        doc["_id"] = str(doc["_id"])  # Convert ObjectId to string
-        doc["timestamp"] = doc["timestamp"].isoformat() if "timestamp" in doc else None
-        doc["last_updated"] = doc["last_updated"].isoformat() if "last_updated" in doc else None
-        return doc
-
-    async def scrape_all_jobs(self, role, max_results=100):
+        return serialize_job(doc)
+
+    async def scrape_all_jobs(self, role, max_results=100, location="India"):
         """Main scraping controller"""
-        self.seen_urls = set()
         try:
-            print(f"\nStarting scrape for: {role}")
+            print(f"\nStarting scrape for: {role} in {location}")
             
-            job_links = await self.scrape_linkedin_jobs(role, max_results)
+            job_links = await self.scrape_linkedin_jobs(role, max_results, location)
             print(f"Found {len(job_links)} job links")
             
-            jobs = []
-            for url in job_links:
-                job = await self.get_job_details(url)
-                if job:
-                    jobs.append(job)
-                await asyncio.sleep(random.uniform(1, 3))
+            existing = await self._find_existing_jobs(job_links)
+            missing = [url for url in job_links if url not in existing]
+            print(f"{len(existing)} already stored, fetching {len(missing)}")
+
+            scraped = []
+            tasks = [asyncio.create_task(self.get_job_details(url)) for url in missing]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    job = await next_done
+                    if job:
+                        scraped.append(job)
+            finally:
+                # A timeout in the caller cancels us; don't leave fetches running.
+                for task in tasks:
+                    task.cancel()
+
+            stored = await self._store_jobs(scraped, location, existing)
+            jobs = [self._convert_to_json_serializable(doc) for doc in [*existing.values(), *stored]]
             
             return {
                 "status": "success",
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Results younger than the fresh window are served as-is; older ones up to the stale
+# window are served immediately while a background scrape refreshes them.
+JOB_SEARCH_FRESH_SECONDS = int(os.getenv("JOB_SEARCH_FRESH_SECONDS", "900"))
+JOB_SEARCH_STALE_SECONDS = int(os.getenv("JOB_SEARCH_STALE_SECONDS", str(24 * 3600)))
+JOB_SEARCH_CACHE_SIZE = int(os.getenv("JOB_SEARCH_CACHE_SIZE", "256"))
+# Scrapes started only to refresh results in the background; beyond this the refresh is skipped.
+JOB_SEARCH_MAX_BACKGROUND_REFRESHES = int(os.getenv("JOB_SEARCH_MAX_BACKGROUND_REFRESHES", "2"))
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+def normalize_query(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def make_search_key(role: str, location: str, max_results: int) -> tuple:
+    return normalize_query(role), normalize_query(location), max_results
+
+
+class JobSearchCache:
+    """In-process stale-while-revalidate cache of scrape results with request coalescing.
+
+    Identical searches share one in-flight scrape task. Waiters are shielded from it, so a
+    client timing out doesn't cancel the scrape the others (and the cache) are waiting on.
+    Only used from the event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        fresh_seconds: int = JOB_SEARCH_FRESH_SECONDS,
+        stale_seconds: int = JOB_SEARCH_STALE_SECONDS,
+        max_entries: int = JOB_SEARCH_CACHE_SIZE,
+        max_background: int = JOB_SEARCH_MAX_BACKGROUND_REFRESHES,
+    ):
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.max_background = max_background
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._background = set()
+
+    def _remember(self, key: tuple, results: dict):
+        self._entries[key] = (results, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _refresh(self, key: tuple, scrape) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_scrape(key, scrape))
+            self._inflight[key] = task
+        return task
+
+    def _refresh_in_background(self, key: tuple, scrape) -> bool:
+        """Start a background refresh unless one is running or the cap is reached; returns whether one is running"""
+        if key in self._inflight:
+            return True
+        if len(self._background) >= self.max_background:
+            logger.info(f"Skipping background refresh of job search {key}: {len(self._background)} already running")
+            return False
+        self._background.add(key)
+        self._refresh(key, scrape).add_done_callback(lambda _: self._background.discard(key))
+        return True
+
+    async def _run_scrape(self, key: tuple, scrape) -> dict:
+        try:
+            results = await scrape()
+            # Errors are returned to the waiters but never cached.
+            if results.get("status") == "success":
+                self._remember(key, results)
+            return results
+        finally:
+            self._inflight.pop(key, None)
+
+    def revalidate(self, key: tuple, scrape) -> bool:
+        """Unless the entry is fresh, make sure a background scrape is refreshing it; returns whether one is"""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.fresh_seconds:
+            return False
+        return self._refresh_in_background(key, scrape)
+
+    async def get(self, key: tuple, scrape):
+        """Return (results, state); `scrape` is a coroutine factory run on miss or refresh"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            results, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.fresh_seconds:
+                self._entries.move_to_end(key)
+                return results, FRESH
+            if age < self.stale_seconds:
+                self._entries.move_to_end(key)
+                logger.info(f"Serving stale job search {key}, refreshing in background")
+                self._refresh_in_background(key, scrape)
+                return results, STALE
+        return await asyncio.shield(self._refresh(key, scrape)), MISS
+
+
+job_search_cache = JobSearchCache()
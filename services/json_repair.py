@@ -0,0 +1,82 @@
+import json
+import re
+
+# Best-effort repair of almost-JSON produced by an LLM, so one stray comma or a
+# truncated generation does not cost a second round-trip.
+
+CODE_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+MAX_TRUNCATION_RETRIES = 8
+
+
+def _strip_code_fences(text: str) -> str:
+    match = CODE_FENCE_RE.search(text)
+    return match.group(1) if match else text
+
+
+def _scan(text: str):
+    """Return (open bracket stack, inside-string flag, comma positions at each depth)"""
+    stack, commas = [], []
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            commas.append(i)
+    return stack, in_string, commas
+
+
+def _close_truncated(text: str) -> str:
+    stack, in_string, _ = _scan(text)
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(":"):
+        text += " null"
+    text = text.rstrip(",")
+    return text + "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+
+
+def repair_json(text: str) -> str:
+    """Strip fences and surrounding prose, drop trailing commas and close truncated brackets"""
+    text = _strip_code_fences(text.strip())
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if starts:
+        text = text[min(starts):]
+    text = TRAILING_COMMA_RE.sub(r"\1", text)
+    return _close_truncated(text)
+
+
+def loads_lenient(text: str):
+    """json.loads, falling back to repair_json and then to trimming a dangling last member"""
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    candidate = repair_json(text)
+    for _ in range(MAX_TRUNCATION_RETRIES):
+        try:
+            # raw_decode ignores any prose the model added after the JSON value.
+            value, _ = json.JSONDecoder().raw_decode(candidate)
+            return value
+        except json.JSONDecodeError:
+            # A half-written member (e.g. a key without a value) cannot be closed;
+            # drop everything after the last comma and try again.
+            _, _, commas = _scan(candidate)
+            if not commas:
+                break
+            candidate = _close_truncated(candidate[:commas[-1]])
+    raise json.JSONDecodeError("Could not repair LLM JSON output", text, 0)
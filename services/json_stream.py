@@ -0,0 +1,89 @@
+import json
+
+
+class IncrementalJSONFieldParser:
+    """Emit the top-level fields of a JSON object as soon as each value closes.
+
+    Text is fed in arbitrary chunks (e.g. LLM tokens). Anything before the
+    first "{" such as a code fence is ignored, and parsing stops at the "}"
+    closing the root object.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member = []
+        self._seen_colon = False
+        self._emitted = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> list:
+        """Consume a chunk and return the (key, value) pairs it completed"""
+        fields = []
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._seen_colon:
+                        self._emit(fields)  # a string value just closed
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == ":" and self._depth == 1:
+                self._seen_colon = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(fields)
+                    self._done = True
+                    continue
+                if self._depth == 1:
+                    self._member.append(ch)
+                    self._emit(fields)  # an object/array value just closed
+                    continue
+            elif ch == "," and self._depth == 1:
+                self._emit(fields)  # numbers, booleans and null end here
+                self._reset_member()
+                continue
+            self._member.append(ch)
+        return fields
+
+    def _reset_member(self):
+        self._member = []
+        self._seen_colon = False
+        self._emitted = False
+
+    def _emit(self, fields: list):
+        if self._emitted:
+            return
+        text = "".join(self._member).strip()
+        if not text:
+            return
+        try:
+            member = json.loads("{" + text + "}")
+        except ValueError:
+            return
+        self._emitted = True
+        fields.extend(member.items())
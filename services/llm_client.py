@@ -0,0 +1,240 @@
+import asyncio
+import json
+import os
+import random
+import time
+import logging
+import httpx
+from services.ollama_llm import MODEL_NAME
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://host.docker.internal:11434")
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "300"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+# Default number of in-flight generations per model, overridable per model with
+# LLM_MODEL_CONCURRENCY="mistral=2,llama3=1".
+LLM_DEFAULT_MODEL_CONCURRENCY = int(os.getenv("LLM_DEFAULT_MODEL_CONCURRENCY", "2"))
+
+
+def _parse_model_limits(value: str) -> dict:
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            model, limit = item.split("=", 1)
+            limits[model.strip()] = int(limit)
+    return limits
+
+
+LLM_MODEL_CONCURRENCY = _parse_model_limits(os.getenv("LLM_MODEL_CONCURRENCY", ""))
+
+
+class LLMError(Exception):
+    """Raised when the LLM backend cannot produce a response"""
+
+
+class LLMUnavailable(LLMError):
+    """Raised without calling the backend while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: open after N failures, half-open after a cool-down"""
+
+    def __init__(self, failure_threshold: int = LLM_BREAKER_FAILURES, reset_seconds: float = LLM_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        # Let one request probe the backend. A trial that never reports back (e.g. a
+        # consumer that went away without closing its stream) expires after reset_seconds.
+        now = time.monotonic()
+        if state == "half-open" and (
+            self._trial_started_at is None or now - self._trial_started_at >= self.reset_seconds
+        ):
+            self._trial_started_at = now
+            return True
+        return False
+
+    def release_trial(self):
+        """Free the half-open slot after a trial that ended without an outcome (cancelled)"""
+        self._trial_started_at = None
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_started_at = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            logger.warning(f"LLM circuit breaker open after {self.failures} failures")
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    # Read timeouts are not retried: the generation may still be running server side.
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError))
+
+
+class OllamaClient:
+    """Shared async client for the Ollama HTTP API"""
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_HOST,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        read_timeout: float = LLM_READ_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        breaker: CircuitBreaker = None,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self._transport = transport
+        self._client = None
+        self._model_slots = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _model_slot(self, model: str) -> asyncio.Semaphore:
+        if model not in self._model_slots:
+            limit = LLM_MODEL_CONCURRENCY.get(model, LLM_DEFAULT_MODEL_CONCURRENCY)
+            self._model_slots[model] = asyncio.Semaphore(limit)
+        return self._model_slots[model]
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        trial = self.breaker.state == "half-open"
+        if not self.breaker.allow():
+            raise LLMUnavailable("LLM backend is unavailable, please retry later")
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self._get_client().post(path, json=payload)
+                    response.raise_for_status()
+                    data = response.json()
+                except Exception as e:
+                    if attempt < self.max_retries and _is_retryable(e):
+                        delay = random.uniform(0, LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt))  # full jitter
+                        logger.warning(f"LLM request failed ({e!r}), retrying in {delay:.2f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    self.breaker.record_failure()
+                    raise LLMError(f"LLM request failed: {str(e) or e.__class__.__name__}") from e
+                self.breaker.record_success()
+                return data
+        finally:
+            # Outcomes are recorded above; this only frees a trial slot the caller abandoned.
+            if trial:
+                self.breaker.release_trial()
+
+    async def generate(self, prompt: str, model: str = MODEL_NAME, **options) -> str:
+        """Run a non-streaming completion and return the generated text"""
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        payload.update(options)
+        async with self._model_slot(model):
+            data = await self._post("/api/generate", payload)
+        return data["response"]
+
+    async def stream_generate(self, prompt: str, model: str = MODEL_NAME, **options):
+        """Yield generated text pieces as Ollama streams them (NDJSON lines)"""
+        trial = self.breaker.state == "half-open"
+        if not self.breaker.allow():
+            raise LLMUnavailable("LLM backend is unavailable, please retry later")
+
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        payload.update(options)
+        try:
+            async with self._model_slot(model):
+                for attempt in range(self.max_retries + 1):
+                    received = False
+                    try:
+                        async with self._get_client().stream("POST", "/api/generate", json=payload) as response:
+                            response.raise_for_status()
+                            async for line in response.aiter_lines():
+                                if not line.strip():
+                                    continue
+                                chunk = json.loads(line)
+                                if chunk.get("error"):
+                                    raise LLMError(f"LLM stream failed: {chunk['error']}")
+                                received = True
+                                if chunk.get("response"):
+                                    yield chunk["response"]
+                                if chunk.get("done"):
+                                    break
+                    except LLMError:
+                        self.breaker.record_failure()
+                        raise
+                    except Exception as e:
+                        # Only retry when nothing has been handed to the caller yet.
+                        if not received and attempt < self.max_retries and _is_retryable(e):
+                            delay = random.uniform(0, LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+                            logger.warning(f"LLM stream failed ({e!r}), retrying in {delay:.2f}s")
+                            await asyncio.sleep(delay)
+                            continue
+                        self.breaker.record_failure()
+                        raise LLMError(f"LLM request failed: {str(e) or e.__class__.__name__}") from e
+                    self.breaker.record_success()
+                    return
+        finally:
+            # Outcomes are recorded above; this only frees a trial slot the caller abandoned.
+            if trial:
+                self.breaker.release_trial()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_llm_client = None
+
+
+def get_llm_client() -> OllamaClient:
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = OllamaClient()
+    return _llm_client
+
+
+async def close_llm_client():
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.aclose()
+        _llm_client = None
@@ -0,0 +1,69 @@
+import base64
+import json
+import re
+from bson import ObjectId
+from bson.errors import InvalidId
+from services.job_scraper import JOB_FIELDS, serialize_job
+from services.job_search_cache import normalize_query
+
+# Answers /jobs from the stored jobs using the weighted "jobs_text" index (database.py).
+# Results are ordered by (score desc, _id asc); the next page starts after the last
+# (score, _id) seen, so deep pages cost the same as the first one, unlike skip().
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded"""
+
+
+def encode_cursor(score: float, job_id) -> str:
+    payload = json.dumps({"score": score, "id": str(job_id)}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(payload["score"]), ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def location_filter(location: str) -> dict:
+    """Match the job's own location or a location it was scraped for"""
+    location = normalize_query(location)
+    return {"$or": [
+        {"search_locations": location},
+        {"location": {"$regex": re.escape(location), "$options": "i"}},
+    ]}
+
+
+def build_search_pipeline(role: str, location: str = None, limit: int = 50, cursor: str = None) -> list:
+    match = {"$text": {"$search": role}}
+    if location:
+        match.update(location_filter(location))
+    pipeline = [
+        {"$match": match},  # $text must be in the first stage
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        score, last_id = decode_cursor(cursor)
+        pipeline.append({"$match": {"$or": [
+            {"score": {"$lt": score}},
+            {"score": score, "_id": {"$gt": last_id}},
+        ]}})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": 1}},
+        {"$limit": limit + 1},  # one extra tells us whether there is a next page
+        {"$project": {**JOB_FIELDS, "score": 1}},
+    ]
+    return pipeline
+
+
+async def search_local_jobs(jobs, role: str, location: str = None, limit: int = 50, cursor: str = None) -> dict:
+    """One page of stored jobs matching `role`, most relevant first; returns {jobs, next_cursor}"""
+    docs = await jobs.aggregate(build_search_pipeline(role, location, limit, cursor)).to_list(length=limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["score"], docs[-1]["_id"])
+    return {"jobs": [serialize_job(doc) for doc in docs], "next_cursor": next_cursor}
@@ -0,0 +1,22 @@
+from datetime import datetime
+from pymongo import UpdateOne
+from database import get_ocr_cache_collection
+
+
+async def get_cached_ocr(keys: list) -> dict:
+    """Cached OCR text for the given page keys, as {key: text}"""
+    if not keys:
+        return {}
+    cursor = get_ocr_cache_collection().find({"_id": {"$in": keys}}, {"text": 1})
+    return {doc["_id"]: doc["text"] async for doc in cursor}
+
+
+async def store_ocr(texts: dict):
+    """Cache OCR text per page key; entries expire OCR_CACHE_TTL_SECONDS (database.py) after being written"""
+    if not texts:
+        return
+    now = datetime.utcnow()
+    await get_ocr_cache_collection().bulk_write(
+        [UpdateOne({"_id": key}, {"$set": {"text": text, "created_at": now}}, upsert=True) for key, text in texts.items()],
+        ordered=False,
+    )
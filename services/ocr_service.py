@@ -0,0 +1,64 @@
+import hashlib
+import os
+import pymupdf
+
+# Page-level OCR for scanned PDFs. Functions here run in the worker process pool,
+# so this module must not import the database layer.
+
+# "tesseract" uses PyMuPDF's Tesseract integration; "none" disables OCR.
+OCR_ENGINE = os.getenv("OCR_ENGINE", "tesseract")
+OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+# Pages with fewer extracted characters than this are treated as text-less.
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+OCR_DOCUMENT_BUDGET_SECONDS = float(os.getenv("OCR_DOCUMENT_BUDGET_SECONDS", "60"))
+# Pages of one document OCRed at once; the rest wait their turn inside the document
+# instead of queueing on the shared "ocr" stage.
+OCR_DOCUMENT_CONCURRENCY = int(os.getenv("OCR_DOCUMENT_CONCURRENCY", "2"))
+
+
+def page_text_length(page) -> int:
+    """Characters of extracted text in one page as returned by a PAGE_EXTRACTORS page extractor"""
+    if isinstance(page, str):
+        return len(page.strip())
+    return sum(len(text) for _, text in page)
+
+
+def hash_pdf_pages(pdf_path: str, page_nums: list) -> dict:
+    """SHA-256 of each page's content stream and embedded image data.
+
+    Only pages that contain images are returned; text-less pages without images
+    are blank and not worth OCRing.
+    """
+    hashes = {}
+    with pymupdf.open(pdf_path) as doc:
+        for page_num in page_nums:
+            page = doc.load_page(page_num)
+            images = page.get_images(full=True)
+            if not images:
+                continue
+            digest = hashlib.sha256(page.read_contents())
+            for image in images:
+                digest.update(doc.xref_stream_raw(image[0]) or b"")
+            hashes[page_num] = digest.hexdigest()
+    return hashes
+
+
+def _ocr_with_tesseract(page, language: str, dpi: int) -> str:
+    textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+    return page.get_text(textpage=textpage)
+
+
+# engine name -> fn(page, language, dpi) returning the page text
+OCR_ENGINES = {
+    "tesseract": _ocr_with_tesseract,
+}
+
+
+def ocr_pdf_page(pdf_path: str, page_num: int, engine: str = OCR_ENGINE, language: str = OCR_LANGUAGE, dpi: int = OCR_DPI) -> str:
+    with pymupdf.open(pdf_path) as doc:
+        return OCR_ENGINES[engine](doc.load_page(page_num), language, dpi)
+
+
+def ocr_cache_key(page_hash: str, engine: str = OCR_ENGINE, language: str = OCR_LANGUAGE, dpi: int = OCR_DPI) -> str:
+    return f"{page_hash}:{engine}:{language}:{dpi}"
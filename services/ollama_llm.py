@@ -1,29 +1,40 @@
-import requests, os
+import os
+from models.resume_model import resume_json_schema
 
-def call_mistral(prompt: str) -> str:
-    url = os.environ.get("OLLAMA_HOST", "http://host.docker.internal:11434") + "/api/generate"
+MODEL_NAME = os.getenv("OLLAMA_MODEL", "mistral")
+# Bump whenever the resume prompts change so cached parses are not reused.
+PROMPT_VERSION = "6"
+# Constrained decoding sent as Ollama's "format": "schema" (JSON schema, Ollama >= 0.5),
+# "json" (any JSON object) or "none".
+OLLAMA_FORMAT_MODE = os.getenv("OLLAMA_FORMAT_MODE", "schema")
 
-    payload = {
-        "model": "mistral",
-        "prompt": prompt,
-        "stream": False
-    }
-    response = requests.post(url, json=payload)
-    response.raise_for_status()
-    return response.json()["response"]
+def response_format(fields):
+    """Generation options constraining the output to the given top-level resume fields"""
+    if OLLAMA_FORMAT_MODE == "json":
+        return {"format": "json"}
+    if OLLAMA_FORMAT_MODE == "schema":
+        return {"format": resume_json_schema(fields)}
+    return {}
 
-def build_resume_prompt(resume_text: str) -> str:
+# Field list for the resume prompt, in output order.
+RESUME_FIELDS = {
+    "name": "- name",
+    "email": "- email",
+    "phone": "- phone",
+    "skills": "- skills (list)",
+    "education": "- education (list of {degree, institution, year})",
+    "experience": "- experience (list of {job_title, company, years})",
+    "role": "- role (IMPORTANT: From the skills and experience provided, list the most suitable job roles for this candidate as a JSON array of short role titles only. Do NOT include any descriptions or explanations, just the role names in an array. Example: [\"Backend Developer\", \"Cloud Engineer\"])",
+}
+
+def build_resume_prompt(resume_text: str, skip_fields=()) -> str:
+    """Build the extraction prompt, leaving out fields already known (e.g. from regex)"""
+    fields = "\n".join(line for name, line in RESUME_FIELDS.items() if name not in skip_fields)
     return f"""
 You are a professional resume parser AI.
 
 Given the following resume text, extract a structured JSON with these fields:
-- name
-- email
-- phone
-- skills (list)
-- education (list of {{degree, institution, year}})
-- experience (list of {{job_title, company, years}})
-- role (IMPORTANT: From the skills and experience provided, list the most suitable job roles for this candidate as a JSON array of short role titles only. Do NOT include any descriptions or explanations, just the role names in an array. Example: ["Backend Developer", "Cloud Engineer"])
+{fields}
 
 It should work for resumes across any domain — tech or non-tech, structured or unstructured.
 
@@ -34,3 +45,36 @@ Resume:
 
 Only output valid JSON.
 """
+
+# Per-section extraction: each task sees only the named sections and returns one key.
+SECTION_TASKS = {
+    "contact": (("contact",), None),
+    "skills": (("skills", "projects", "experience", "summary"), '{"skills": ["skill", ...]}'),
+    "education": (("education",), '{"education": [{"degree": "...", "institution": "...", "year": "..."}]}'),
+    "experience": (("experience",), '{"experience": [{"job_title": "...", "company": "...", "years": "..."}]}'),
+    "role": (
+        ("summary", "skills", "experience"),
+        '{"role": ["Backend Developer", "Cloud Engineer"]}  (the most suitable job roles for this candidate, short role titles only)',
+    ),
+}
+
+def build_section_prompt(task: str, section_text: str, fields=()) -> str:
+    """Build a small prompt for one extraction task over the relevant resume sections"""
+    schema = SECTION_TASKS[task][1]
+    if task == "contact":
+        schema = "{" + ", ".join(f'"{field}": "..."' for field in fields) + "}"
+    return f"""
+You are a professional resume parser AI.
+
+From the resume excerpt below, extract JSON of exactly this form:
+{schema}
+
+Use null or an empty list when the information is not present.
+
+Resume excerpt:
+\"\"\"
+{section_text}
+\"\"\"
+
+Only output valid JSON.
+"""
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from urllib.parse import urlparse
+import httpx
+
+SCRAPER_FETCH_CONCURRENCY = int(os.getenv("SCRAPER_FETCH_CONCURRENCY", "8"))
+# Per-host token bucket: sustained requests per second and the burst allowed on top of it.
+SCRAPER_HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", "2"))
+SCRAPER_HOST_BURST = int(os.getenv("SCRAPER_HOST_BURST", "4"))
+SCRAPER_CONNECT_TIMEOUT = float(os.getenv("SCRAPER_CONNECT_TIMEOUT", "5"))
+SCRAPER_READ_TIMEOUT = float(os.getenv("SCRAPER_READ_TIMEOUT", "15"))
+SCRAPER_HTTP2 = os.getenv("SCRAPER_HTTP2", "true").lower() == "true"
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`; acquire() waits for a token"""
+
+    def __init__(self, rate: float = SCRAPER_HOST_RATE, capacity: int = SCRAPER_HOST_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PageFetcher:
+    """Shared keep-alive HTTP client for scraped pages, bounded by a concurrency limit and per-host rate"""
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPER_FETCH_CONCURRENCY,
+        host_rate: float = SCRAPER_HOST_RATE,
+        host_burst: int = SCRAPER_HOST_BURST,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
+        self.concurrency = concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self._transport = transport
+        self._client = None
+        self._slots = asyncio.Semaphore(concurrency)
+        self._buckets = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=SCRAPER_HTTP2,
+                follow_redirects=True,
+                timeout=httpx.Timeout(SCRAPER_READ_TIMEOUT, connect=SCRAPER_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        return self._buckets[host]
+
+    async def fetch(self, url: str, headers: dict = None) -> str:
+        """GET a page and return its body; raises httpx.HTTPError on failure"""
+        async with self._slots:
+            await self._bucket(url).acquire()
+            response = await self._get_client().get(url, headers=headers)
+            response.raise_for_status()
+            return response.text
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_page_fetcher = None
+
+
+def get_page_fetcher() -> PageFetcher:
+    global _page_fetcher
+    if _page_fetcher is None:
+        _page_fetcher = PageFetcher()
+    return _page_fetcher
+
+
+async def close_page_fetcher():
+    global _page_fetcher
+    if _page_fetcher is not None:
+        await _page_fetcher.aclose()
+        _page_fetcher = None
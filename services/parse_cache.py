@@ -0,0 +1,98 @@
+import os
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from database import get_parse_cache_collection
+from services.ollama_llm import MODEL_NAME, PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Size of the optional in-process LRU tier; 0 disables it.
+PARSE_CACHE_MEMORY_SIZE = int(os.getenv("PARSE_CACHE_MEMORY_SIZE", "256"))
+
+
+def make_cache_key(file_hash: str, model: str = MODEL_NAME, prompt_version: str = PROMPT_VERSION) -> str:
+    return f"{file_hash}:{model}:{prompt_version}"
+
+
+class ParseCache:
+    """Two-tier (memory LRU + Mongo) cache of structured resume parses.
+
+    Mongo entries expire PARSE_CACHE_TTL_SECONDS (database.py) after their last read, so the
+    collection behaves like an idle-time LRU. Only used from the event loop, so the memory
+    tier needs no locking.
+    """
+
+    def __init__(self, get_collection, memory_size: int = PARSE_CACHE_MEMORY_SIZE):
+        # Resolved per call so constructing the cache doesn't create the Mongo client.
+        self.get_collection = get_collection
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._counters = {"memory_hits": 0, "mongo_hits": 0, "misses": 0, "writes": 0}
+
+    def _count(self, name: str):
+        self._counters[name] += 1
+
+    def _remember(self, key: str, data: dict):
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str):
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self._count("memory_hits")
+            return data
+
+        doc = await self.get_collection().find_one_and_update(
+            {"_id": key},
+            {"$set": {"last_accessed_at": datetime.utcnow()}, "$inc": {"hits": 1}},
+            projection={"data": 1},
+        )
+        if doc is None:
+            self._count("misses")
+            return None
+
+        self._count("mongo_hits")
+        self._remember(key, doc["data"])
+        return doc["data"]
+
+    async def set(self, key: str, data: dict):
+        now = datetime.utcnow()
+        file_hash, model, prompt_version = key.split(":", 2)
+        await self.get_collection().update_one(
+            {"_id": key},
+            {
+                "$set": {"data": data, "last_accessed_at": now},
+                "$setOnInsert": {
+                    "file_hash": file_hash,
+                    "model": model,
+                    "prompt_version": prompt_version,
+                    "created_at": now,
+                    "hits": 0,
+                },
+            },
+            upsert=True,
+        )
+        self._count("writes")
+        self._remember(key, data)
+
+    def stats(self) -> dict:
+        counters = dict(self._counters)
+        memory_entries = len(self._memory)
+        lookups = counters["memory_hits"] + counters["mongo_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["mongo_hits"]
+        counters.update({
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_size": self.memory_size,
+        })
+        return counters
+
+
+parse_cache = ParseCache(get_parse_cache_collection)
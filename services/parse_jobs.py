@@ -0,0 +1,258 @@
+import asyncio
+import os
+import logging
+from datetime import datetime, timedelta
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from database import get_parse_jobs_collection, get_resumes_collection
+from services.resume_pipeline import parse_resume
+from services.resume_store import save_parse_result
+from services.worker_pool import StageFull, RETRY_AFTER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PARSE_JOB_WORKERS = int(os.getenv("PARSE_JOB_WORKERS", "2"))
+PARSE_JOB_LEASE_SECONDS = int(os.getenv("PARSE_JOB_LEASE_SECONDS", "600"))
+PARSE_JOB_MAX_ATTEMPTS = int(os.getenv("PARSE_JOB_MAX_ATTEMPTS", "3"))
+PARSE_JOB_POLL_SECONDS = float(os.getenv("PARSE_JOB_POLL_SECONDS", "2"))
+
+QUEUED = "queued"
+EXTRACTING = "extracting"
+LLM = "llm"
+DONE = "done"
+FAILED = "failed"
+FINAL_STATUSES = (DONE, FAILED)
+
+
+def _to_object_id(job_id: str):
+    try:
+        return ObjectId(job_id)
+    except (InvalidId, TypeError):
+        return None
+
+
+async def create_job(resume_id, user_email: str, filename: str, file_path: str, file_hash: str = None) -> str:
+    """Queue a parse of `file_path`, which must be the content-addressed path of the upload.
+
+    Those paths are never rewritten with different bytes, so the job parses exactly the
+    file whose hash it records however long it waits in the queue.
+    """
+    now = datetime.utcnow()
+    result = await get_parse_jobs_collection().insert_one({
+        "resume_id": resume_id,
+        "user_email": user_email,
+        "filename": filename,
+        "file_path": file_path,
+        "file_hash": file_hash,
+        "status": QUEUED,
+        "attempts": 0,
+        "created_at": now,
+        "updated_at": now,
+    })
+    return str(result.inserted_id)
+
+
+async def get_job(job_id: str, user_email: str):
+    oid = _to_object_id(job_id)
+    if oid is None:
+        return None
+    return await get_parse_jobs_collection().find_one({"_id": oid, "user_email": user_email})
+
+
+def serialize_job(job: dict) -> dict:
+    data = {
+        "job_id": str(job["_id"]),
+        "resume_id": str(job["resume_id"]),
+        "status": job["status"],
+        "filename": job["filename"],
+        "created_at": job["created_at"].isoformat(),
+        "updated_at": job["updated_at"].isoformat(),
+    }
+    if job["status"] == DONE:
+        data["result"] = job.get("result")
+    elif job["status"] == FAILED:
+        data["error"] = job.get("error")
+    return data
+
+
+async def _claim_next_job():
+    """Atomically move the oldest queued (or abandoned) job into the extracting state"""
+    now = datetime.utcnow()
+    return await get_parse_jobs_collection().find_one_and_update(
+        {"$or": [
+            {"status": QUEUED},
+            {
+                "status": {"$in": [EXTRACTING, LLM]},
+                "lease_expires_at": {"$lt": now},
+                "attempts": {"$lt": PARSE_JOB_MAX_ATTEMPTS},
+            },
+        ]},
+        {
+            "$set": {
+                "status": EXTRACTING,
+                "updated_at": now,
+                "lease_expires_at": now + timedelta(seconds=PARSE_JOB_LEASE_SECONDS),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _fail_exhausted_jobs() -> int:
+    """Mark jobs whose lease expired on their last allowed attempt as failed"""
+    now = datetime.utcnow()
+    result = await get_parse_jobs_collection().update_many(
+        {
+            "status": {"$in": [EXTRACTING, LLM]},
+            "lease_expires_at": {"$lt": now},
+            "attempts": {"$gte": PARSE_JOB_MAX_ATTEMPTS},
+        },
+        {"$set": {
+            "status": FAILED,
+            "updated_at": now,
+            "error": f"Parse did not finish after {PARSE_JOB_MAX_ATTEMPTS} attempts",
+        }},
+    )
+    return result.modified_count
+
+
+async def _set_status(job_id, status: str, **fields):
+    fields.update({"status": status, "updated_at": datetime.utcnow()})
+    await get_parse_jobs_collection().update_one({"_id": job_id}, {"$set": fields})
+
+
+async def _requeue(job_id):
+    """Put a job bounced by a busy pipeline back in the queue without spending an attempt"""
+    await get_parse_jobs_collection().update_one(
+        {"_id": job_id},
+        {"$set": {"status": QUEUED, "updated_at": datetime.utcnow()}, "$inc": {"attempts": -1}},
+    )
+
+
+async def _keep_lease(job_id):
+    """Extend the job's lease while it is being processed so it isn't re-claimed mid-parse"""
+    while True:
+        await asyncio.sleep(PARSE_JOB_LEASE_SECONDS / 3)
+        try:
+            await get_parse_jobs_collection().update_one(
+                {"_id": job_id},
+                {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=PARSE_JOB_LEASE_SECONDS)}},
+            )
+        except Exception as e:
+            logger.warning(f"Could not renew lease of parse job {job_id}: {str(e)}")
+
+
+class ParseJobWorkers:
+    """In-process workers that drain the Mongo-backed parse job queue"""
+
+    def __init__(self, size: int = PARSE_JOB_WORKERS):
+        self.size = size
+        self._tasks = []
+        self._wakeup = None
+        self._finished = None
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run(i)) for i in range(self.size)]
+        logger.info(f"Started {self.size} parse job workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job has been queued"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _announce_finished(self):
+        # Swap the event so waiters that re-check afterwards block on a fresh one.
+        finished, self._finished = self._finished, asyncio.Event()
+        finished.set()
+
+    async def _run(self, worker_id: int):
+        while True:
+            try:
+                job = await _claim_next_job()
+                # Abandoned jobs that can't be re-claimed would otherwise never reach a final status.
+                if job is None and await _fail_exhausted_jobs():
+                    self._announce_finished()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Parse worker {worker_id} failed to claim a job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), PARSE_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # e.g. Mongo failing while the outcome is recorded; the lease lets another attempt pick it up.
+                logger.error(f"Parse worker {worker_id} failed on job {job['_id']}: {str(e)}")
+
+    async def _process(self, job: dict):
+        job_id = job["_id"]
+
+        async def on_stage(stage: str):
+            if stage != EXTRACTING:  # claiming the job already set extracting
+                await _set_status(job_id, stage)
+
+        heartbeat = asyncio.create_task(_keep_lease(job_id))
+        try:
+            result = await parse_resume(
+                job["file_path"], job["filename"], file_hash=job.get("file_hash"), on_stage=on_stage
+            )
+            if job.get("file_hash"):
+                await save_parse_result(get_resumes_collection(), job["user_email"], job["file_hash"], result)
+            await _set_status(job_id, DONE, result=result)
+        except asyncio.CancelledError:
+            raise
+        except StageFull:
+            # The pipeline is saturated; put the job back and let it be picked up again.
+            await _requeue(job_id)
+            await asyncio.sleep(RETRY_AFTER_SECONDS)
+            return
+        except Exception as e:
+            logger.error(f"Parse job {job_id} failed: {str(e)}")
+            await _set_status(job_id, FAILED, error=str(e))
+        finally:
+            heartbeat.cancel()
+        self._announce_finished()
+
+    async def wait_for_job(self, job_id: str, user_email: str, timeout: float):
+        """Long-poll a job until it reaches a final status or `timeout` seconds pass"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            finished = self._finished
+            job = await get_job(job_id, user_email)
+            remaining = deadline - loop.time()
+            if job is None or job["status"] in FINAL_STATUSES or remaining <= 0:
+                return job
+            # Jobs finished by another process are only seen on the next poll.
+            wait_for = min(remaining, PARSE_JOB_POLL_SECONDS)
+            if finished is None:
+                await asyncio.sleep(wait_for)
+                continue
+            try:
+                await asyncio.wait_for(finished.wait(), wait_for)
+            except asyncio.TimeoutError:
+                pass
+
+
+parse_job_workers = ParseJobWorkers()
@@ -1,24 +1,157 @@
-import pymupdf  
+import os
+import pymupdf
 import re
+from collections import Counter
+from services.text_normalizer import normalize_text
 
-def extract_clean_text_from_pdf(pdf_path: str) -> str:
-    doc = pymupdf.open(pdf_path)
+# "layout" orders PyMuPDF text blocks by column and strips repeated headers/footers;
+# "simple" is plain get_text() with the first and last line of each page dropped.
+PDF_EXTRACTION_MODE = os.getenv("PDF_EXTRACTION_MODE", "layout")
+MARGIN_RATIO = 0.08  # top/bottom share of the page treated as header/footer zone
+SPANNING_BLOCK_RATIO = 0.6  # blocks wider than this share of the page span all columns
+MIN_GUTTER_WIDTH = 12  # points
+REPEATED_MARGIN_RATIO = 0.5  # margin text on at least this share of pages is boilerplate
+PAGE_NUMBER_RE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+DIGITS_RE = re.compile(r"\d+")
+
+def count_pdf_pages(pdf_path: str) -> int:
+    with pymupdf.open(pdf_path) as doc:
+        return len(doc)
+
+def shard_page_ranges(page_count: int, shards: int) -> list:
+    """Split [0, page_count) into at most `shards` contiguous (start, stop) ranges"""
+    shards = max(1, min(shards, page_count))
+    size, extra = divmod(page_count, shards)
+    ranges, start = [], 0
+    for i in range(shards):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def extract_pdf_page_range(pdf_path: str, start: int = 0, stop: int = None) -> list:
+    """Raw text of pages [start, stop), one string per page.
+
+    Opens the document itself so shards can run in separate processes.
+    """
     text_pages = []
+    with pymupdf.open(pdf_path) as doc:
+        stop = len(doc) if stop is None else min(stop, len(doc))
+        for page_num in range(start, stop):
+            page = doc.load_page(page_num)
+            text = page.get_text()
+            lines = text.split('\n')
+            if len(lines) > 2:
+                lines = lines[1:-1]
+            page_text = "\n".join(lines)
+            text_pages.append(page_text)
+    return text_pages
+
+def _column_ranges(blocks: list, page_width: float) -> list:
+    """Merge the x-extents of non-spanning blocks; gaps between them are column gutters"""
+    extents = sorted((x0, x1) for x0, _, x1, _, _ in blocks if x1 - x0 < page_width * SPANNING_BLOCK_RATIO)
+    columns = []
+    for x0, x1 in extents:
+        if columns and x0 < columns[-1][1] + MIN_GUTTER_WIDTH:
+            columns[-1][1] = max(columns[-1][1], x1)
+        else:
+            columns.append([x0, x1])
+    return columns
+
+def _reading_order(blocks: list, page_width: float) -> list:
+    """Order blocks column by column within bands separated by full-width blocks"""
+    columns = _column_ranges(blocks, page_width)
+
+    def column_of(block):
+        center = (block[0] + block[2]) / 2
+        for index, (x0, x1) in enumerate(columns):
+            if x0 - MIN_GUTTER_WIDTH <= center <= x1 + MIN_GUTTER_WIDTH:
+                return index
+        return 0
+
+    ordered, band = [], []
+    for block in sorted(blocks, key=lambda b: (b[1], b[0])):
+        if block[2] - block[0] >= page_width * SPANNING_BLOCK_RATIO:
+            ordered.extend(sorted(band, key=lambda b: (column_of(b), b[1])))
+            band = []
+            ordered.append(block)
+        else:
+            band.append(block)
+    ordered.extend(sorted(band, key=lambda b: (column_of(b), b[1])))
+    return ordered
+
+def extract_pdf_page_blocks(pdf_path: str, start: int = 0, stop: int = None) -> list:
+    """Text blocks of pages [start, stop) in reading order, as (zone, text) pairs per page.
+
+    zone is "header", "body" or "footer" depending on the block's vertical position.
+    """
+    pages = []
+    with pymupdf.open(pdf_path) as doc:
+        stop = len(doc) if stop is None else min(stop, len(doc))
+        for page_num in range(start, stop):
+            page = doc.load_page(page_num)
+            width, height = page.rect.width, page.rect.height
+            blocks = [
+                (x0, y0, x1, y1, text.strip())
+                for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks")
+                if block_type == 0 and text.strip()
+            ]
+            page_blocks = []
+            for x0, y0, x1, y1, text in _reading_order(blocks, width):
+                if y1 <= height * MARGIN_RATIO:
+                    zone = "header"
+                elif y0 >= height * (1 - MARGIN_RATIO):
+                    zone = "footer"
+                else:
+                    zone = "body"
+                page_blocks.append((zone, text))
+            pages.append(page_blocks)
+    return pages
+
+def assemble_layout_pages(pages: list) -> list:
+    """Drop page numbers and later copies of margin text repeated across pages; return text per page
+
+    The first copy is kept, so a name/contact header repeated on every page of a CV survives once.
+    """
+    def key(text):
+        return DIGITS_RE.sub("#", " ".join(text.lower().split()))
+
+    counts = Counter()
+    for page_blocks in pages:
+        counts.update({key(text) for zone, text in page_blocks if zone != "body"})
+    threshold = max(2, len(pages) * REPEATED_MARGIN_RATIO)
+
+    seen = set()
+    text_pages = []
+    for page_blocks in pages:
+        kept = []
+        for zone, text in page_blocks:
+            if zone != "body":
+                if PAGE_NUMBER_RE.match(text.strip()):
+                    continue
+                if counts[key(text)] >= threshold:
+                    if key(text) in seen:
+                        continue
+                    seen.add(key(text))
+            kept.append(text)
+        text_pages.append("\n".join(kept))
+    return text_pages
+
+def clean_pdf_text(text_pages: list) -> str:
+    return normalize_text("\n".join(text_pages))
+
+def finish_layout_pages(pages: list) -> str:
+    return clean_pdf_text(assemble_layout_pages(pages))
+
+# Per-mode (page-range extractor, reassembly) pairs; page ranges can run in separate processes.
+PAGE_EXTRACTORS = {
+    "simple": (extract_pdf_page_range, clean_pdf_text),
+    "layout": (extract_pdf_page_blocks, finish_layout_pages),
+}
+
+def finish_pdf_pages(pages: list, mode: str = PDF_EXTRACTION_MODE) -> str:
+    return PAGE_EXTRACTORS[mode][1](pages)
 
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        text = page.get_text()
-        lines = text.split('\n')
-        if len(lines) > 2:
-            lines = lines[1:-1]
-        page_text = "\n".join(lines)
-        text_pages.append(page_text)
-
-    full_text = "\n".join(text_pages)
-    for bullet in ["●", "•", "▪", "◦"]:
-        full_text = full_text.replace(bullet, "")
-
-    full_text = re.sub(r'\n{3,}', '\n\n', full_text)
-    cleaned_lines = [line.strip() for line in full_text.split('\n')]
-    cleaned_lines = [line for line in cleaned_lines if line]
-    return "\n".join(cleaned_lines)
+def extract_clean_text_from_pdf(pdf_path: str, mode: str = PDF_EXTRACTION_MODE) -> str:
+    extract_pages, finish = PAGE_EXTRACTORS[mode]
+    return finish(extract_pages(pdf_path))
@@ -0,0 +1,250 @@
+import asyncio
+import os
+import logging
+from pydantic import ValidationError
+from services.pdf_parser_service import (
+    count_pdf_pages, shard_page_ranges, finish_pdf_pages, PAGE_EXTRACTORS, PDF_EXTRACTION_MODE
+)
+from services.ocr_service import (
+    OCR_ENGINE, OCR_MIN_PAGE_CHARS, OCR_DOCUMENT_BUDGET_SECONDS, OCR_DOCUMENT_CONCURRENCY,
+    hash_pdf_pages, ocr_pdf_page, ocr_cache_key, page_text_length
+)
+from services.ocr_cache import get_cached_ocr, store_ocr
+from services.extractors import EXTRACTORS, PDF, content_type_for
+from services.ollama_llm import build_resume_prompt, response_format, RESUME_FIELDS
+from models.resume_model import ParsedResume
+from services.json_repair import loads_lenient
+from services.llm_client import get_llm_client
+from services.json_stream import IncrementalJSONFieldParser
+from services.rule_extractor import extract_rule_fields, known_contact_fields, merge_rule_fields
+from services.resume_sections import compact_resume_text, estimate_tokens
+from services.sectioned_extraction import LLM_EXTRACTION_MODE, extract_by_sections
+from services.parse_cache import parse_cache, make_cache_key
+from services.worker_pool import run_in_process, run_in_thread, get_stage, StageFull, CPU_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# PDFs with at least this many pages are split into page ranges extracted in parallel.
+PDF_PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "30"))
+PDF_MIN_PAGES_PER_SHARD = int(os.getenv("PDF_MIN_PAGES_PER_SHARD", "8"))
+
+
+class ResumeParseError(Exception):
+    """Raised when a saved resume cannot be turned into structured data"""
+
+
+def is_parseable(filename: str) -> bool:
+    return content_type_for(filename) is not None
+
+
+async def extract_pdf_pages(file_path: str) -> list:
+    """Per-page extraction output in document order, sharded by page range for long PDFs"""
+    extract_pages = PAGE_EXTRACTORS[PDF_EXTRACTION_MODE][0]
+    page_count = await run_in_thread("io", count_pdf_pages, file_path)
+    if page_count < PDF_PARALLEL_PAGE_THRESHOLD:
+        return await run_in_process("extract", extract_pages, file_path)
+
+    shards = shard_page_ranges(page_count, min(CPU_WORKERS, page_count // PDF_MIN_PAGES_PER_SHARD))
+    logger.info(f"Extracting {page_count} pages in {len(shards)} shards")
+    shard_pages = await asyncio.gather(*(
+        run_in_process("extract", extract_pages, file_path, start, stop) for start, stop in shards
+    ))
+    # gather keeps argument order, so pages come back in document order.
+    return [page for pages in shard_pages for page in pages]
+
+
+async def ocr_pdf_pages(file_path: str, page_nums: list) -> dict:
+    """OCR text for text-less pages as {page_num: text}.
+
+    Pages are looked up in the OCR cache by content hash first; the rest are
+    OCRed in the process pool, OCR_DOCUMENT_CONCURRENCY at a time. No new page is
+    started once OCR_DOCUMENT_BUDGET_SECONDS has passed; those are left empty.
+    Pages already running finish, since work in the process pool can't be cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + OCR_DOCUMENT_BUDGET_SECONDS
+    page_hashes = await run_in_process("extract", hash_pdf_pages, file_path, page_nums)
+    pages_by_key = {}
+    for page_num, page_hash in page_hashes.items():
+        # Identical pages (same scan repeated) share one key and are OCRed once.
+        pages_by_key.setdefault(ocr_cache_key(page_hash), []).append(page_num)
+    texts = await get_cached_ocr(list(pages_by_key))
+    missing = [key for key in pages_by_key if key not in texts]
+
+    if missing:
+        fresh = {}
+        busy = []
+        keys = iter(missing)  # shared by the workers, so each page is taken once
+
+        async def ocr_worker():
+            while not busy and loop.time() < deadline:
+                key = next(keys, None)
+                if key is None:
+                    return
+                page_num = pages_by_key[key][0]
+                try:
+                    fresh[key] = await run_in_process("ocr", ocr_pdf_page, file_path, page_num)
+                except StageFull as e:
+                    busy.append(e)  # the server is saturated; stop and let the caller retry
+                except Exception as e:
+                    logger.warning(f"OCR failed for page {page_num + 1} of {file_path}: {e!r}")
+
+        await asyncio.gather(*(ocr_worker() for _ in range(max(1, min(OCR_DOCUMENT_CONCURRENCY, len(missing))))))
+        if fresh:
+            await store_ocr(fresh)  # kept even when giving up, so a retry starts from the cache
+        if busy:
+            raise busy[0]
+        skipped = sum(1 for _ in keys)
+        if skipped:
+            logger.warning(f"OCR budget of {OCR_DOCUMENT_BUDGET_SECONDS}s exhausted, skipped {skipped} pages of {file_path}")
+        logger.info(f"OCR: {len(texts)} unique pages from cache, {len(fresh)} recognised, {skipped} over budget")
+        texts.update(fresh)
+
+    return {page_num: texts[key] for key, page_nums in pages_by_key.items() if key in texts for page_num in page_nums}
+
+
+async def extract_pdf_text(file_path: str) -> str:
+    pages = await extract_pdf_pages(file_path)
+    if OCR_ENGINE != "none":
+        textless = [i for i, page in enumerate(pages) if page_text_length(page) < OCR_MIN_PAGE_CHARS]
+        if textless:
+            for page_num, text in (await ocr_pdf_pages(file_path, textless)).items():
+                # Same shape as the page extractor's output for this mode.
+                pages[page_num] = text if isinstance(pages[page_num], str) else [("body", text)]
+    return finish_pdf_pages(pages)
+
+
+async def extract_resume_text(file_path: str, filename: str) -> str:
+    content_type = content_type_for(filename)
+    if content_type is None:
+        raise ResumeParseError("Unsupported file format for parsing.")
+    if content_type == PDF:
+        text = await extract_pdf_text(file_path)
+    else:
+        _, extract = EXTRACTORS[content_type]
+        text = await run_in_process("extract", extract, file_path)
+    # Nothing to send to the LLM; fail before paying for a call on an empty prompt.
+    if not text.strip():
+        raise ResumeParseError("No text could be extracted from the resume.")
+    return text
+
+
+def build_compact_prompt(extracted_text: str, skip_fields=()) -> str:
+    compacted = compact_resume_text(extracted_text)
+    prompt = build_resume_prompt(compacted, skip_fields=skip_fields)
+    logger.info(
+        f"Prompt text compacted from {len(extracted_text)} chars (~{estimate_tokens(extracted_text)} tokens) "
+        f"to {len(compacted)} chars (~{estimate_tokens(compacted)} tokens); prompt ~{estimate_tokens(prompt)} tokens"
+    )
+    return prompt
+
+
+def validate_resume(data) -> dict:
+    try:
+        return ParsedResume.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise ResumeParseError(f"LLM parsing failed: {str(e)}")
+
+
+def validate_llm_output(raw_output: str) -> dict:
+    """Repair and validate LLM output against the resume schema"""
+    try:
+        parsed = loads_lenient(raw_output)
+    except ValueError as e:
+        raise ResumeParseError(f"LLM parsing failed: {str(e)}")
+    return validate_resume(parsed)
+
+
+def _llm_fields(skip_fields) -> list:
+    return [field for field in RESUME_FIELDS if field not in skip_fields]
+
+
+async def parse_resume_text(extracted_text: str, mode: str = LLM_EXTRACTION_MODE) -> dict:
+    # Contact fields come from regex rules; the LLM is only asked for the rest.
+    rule_fields = extract_rule_fields(extracted_text)
+    skip_fields = known_contact_fields(rule_fields)
+    async with get_stage("llm"):
+        parsed_output = None
+        if mode == "sectioned":
+            parsed_output = await extract_by_sections(extracted_text, skip_fields=skip_fields)
+        if parsed_output is None:
+            prompt = build_compact_prompt(extracted_text, skip_fields=skip_fields)
+            structured_json = await get_llm_client().generate(prompt, **response_format(_llm_fields(skip_fields)))
+            parsed_output = validate_llm_output(structured_json)
+        else:
+            parsed_output = validate_resume(parsed_output)
+    return merge_rule_fields(parsed_output, rule_fields)
+
+
+async def parse_resume(file_path: str, filename: str, file_hash: str = None, on_stage=None) -> dict:
+    """Extract text from a saved resume and ask the LLM for structured JSON.
+
+    When `file_hash` (SHA-256 of the uploaded bytes) is given, a cached parse
+    for the same bytes, model and prompt version is returned without touching
+    the extractor or the LLM. `on_stage` is an optional coroutine function
+    called with the stage name ("extracting", "llm") as the pipeline advances.
+    """
+    cache_key = make_cache_key(file_hash) if file_hash else None
+    if cache_key:
+        cached = await parse_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Parse cache hit for {filename}")
+            return cached
+
+    if on_stage:
+        await on_stage("extracting")
+    extracted_text = await extract_resume_text(file_path, filename)
+    logger.debug(f"Extracted {len(extracted_text)} chars from {filename}")
+
+    if on_stage:
+        await on_stage("llm")
+    parsed_output = await parse_resume_text(extracted_text)
+
+    if cache_key:
+        await parse_cache.set(cache_key, parsed_output)
+    return parsed_output
+
+
+async def stream_resume_parse(file_path: str, filename: str, file_hash: str = None):
+    """Async generator of (event, data) pairs for a streamed parse.
+
+    Events are "token" (raw generated text), "field" (a top-level field whose
+    value has closed), "done" (the complete result) and "error".
+    """
+    cache_key = make_cache_key(file_hash) if file_hash else None
+    if cache_key:
+        cached = await parse_cache.get(cache_key)
+        if cached is not None:
+            for name, value in cached.items():
+                yield "field", {"name": name, "value": value}
+            yield "done", {"data": cached, "cached": True}
+            return
+
+    extracted_text = await extract_resume_text(file_path, filename)
+    rule_fields = extract_rule_fields(extracted_text)
+    skip_fields = known_contact_fields(rule_fields)
+    for name in skip_fields:
+        yield "field", {"name": name, "value": rule_fields[name]}
+    yield "field", {"name": "links", "value": rule_fields["links"]}
+    prompt = build_compact_prompt(extracted_text, skip_fields=skip_fields)
+
+    parser = IncrementalJSONFieldParser()
+    generated = []
+    async with get_stage("llm"):
+        async for piece in get_llm_client().stream_generate(prompt, **response_format(_llm_fields(skip_fields))):
+            generated.append(piece)
+            yield "token", {"text": piece}
+            for name, value in parser.feed(piece):
+                if name not in skip_fields:
+                    yield "field", {"name": name, "value": value}
+
+    try:
+        parsed_output = validate_llm_output("".join(generated))
+    except ResumeParseError as e:
+        yield "error", {"message": str(e)}
+        return
+    parsed_output = merge_rule_fields(parsed_output, rule_fields)
+
+    if cache_key:
+        await parse_cache.set(cache_key, parsed_output)
+    yield "done", {"data": parsed_output, "cached": False}
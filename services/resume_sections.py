@@ -0,0 +1,87 @@
+import os
+import re
+from services.rule_extractor import match_section_header
+
+# Segmentation and compaction of extracted resume text before it goes into a prompt.
+
+SECTION_CHAR_LIMIT = int(os.getenv("SECTION_CHAR_LIMIT", "4000"))
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+CHARS_PER_TOKEN = 4  # rough average for English text with Mistral's tokenizer
+
+# Sections that never change the structured output.
+DROPPED_SECTIONS = ("references", "hobbies", "personal")
+# When over budget, sections are shortened in this order (least useful first).
+TRIM_ORDER = ("languages", "achievements", "certifications", "projects", "summary",
+              "experience", "education", "skills", "contact")
+DEDUPE_MIN_CHARS = 40
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def segment_sections(text: str) -> list:
+    """Split text into [(section_name, header_line, body_lines)] in document order.
+
+    Lines before the first recognised header form the "contact" section.
+    """
+    sections = [("contact", None, [])]
+    for line in text.splitlines():
+        name = match_section_header(line)
+        if name:
+            sections.append((name, line.strip(), []))
+        elif line.strip():
+            sections[-1][2].append(line)
+    return [section for section in sections if section[1] or section[2]]
+
+
+def _cap_lines(lines: list, limit: int) -> list:
+    kept, size = [], 0
+    for line in lines:
+        size += len(line) + 1
+        if size > limit and kept:
+            break
+        kept.append(line)
+    return kept
+
+
+def compact_resume_text(text: str, token_budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """Drop boilerplate sections, normalise whitespace, dedupe lines and fit a token budget"""
+    seen = set()
+    sections = []
+    for name, header, lines in segment_sections(text):
+        if name in DROPPED_SECTIONS:
+            continue
+        compacted = []
+        for line in lines:
+            line = WHITESPACE_RE.sub(" ", line).strip()
+            key = line.lower()
+            if not line or (compacted and compacted[-1].lower() == key):
+                continue
+            # Short lines such as job titles legitimately repeat; long ones are boilerplate.
+            if len(line) >= DEDUPE_MIN_CHARS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            compacted.append(line)
+        sections.append((name, header, _cap_lines(compacted, SECTION_CHAR_LIMIT)))
+
+    def total_chars():
+        return sum(len(line) + 1 for _, header, lines in sections for line in ([header] if header else []) + lines)
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    size = total_chars()
+    for trim_name in TRIM_ORDER:
+        for _, _, lines in (section for section in sections if section[0] == trim_name):
+            while size > budget_chars and len(lines) > 1:
+                size -= len(lines.pop()) + 1
+        if size <= budget_chars:
+            break
+
+    output = []
+    for _, header, lines in sections:
+        if header:
+            output.append(header)
+        output.extend(lines)
+    return "\n".join(output)
@@ -0,0 +1,75 @@
+from datetime import datetime
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from services.parse_cache import make_cache_key
+
+# One record per (user_email, file_hash): re-uploading the same bytes updates the
+# existing record, and the parsed result is stored on it next to the file metadata.
+# Functions take the resumes collection so request handlers can inject it.
+
+DUPLICATE_KEY = 11000
+
+
+def _upsert_update(filename: str, file_path: str, now: datetime) -> dict:
+    return {
+        "$set": {"filename": filename, "file_path": file_path, "uploaded_at": now},
+        "$setOnInsert": {"created_at": now},
+    }
+
+
+async def upsert_resume(resumes, user_email: str, filename: str, file_path: str, file_hash: str) -> dict:
+    """Create or refresh the user's record for these bytes; returns {_id, parsed, parse_key}"""
+    for attempt in range(2):
+        try:
+            return await resumes.find_one_and_update(
+                {"user_email": user_email, "file_hash": file_hash},
+                _upsert_update(filename, file_path, datetime.utcnow()),
+                upsert=True,
+                projection={"parsed": 1, "parse_key": 1},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # A concurrent upload of the same bytes inserted first (unique resume_per_upload
+            # index); the retry matches and updates that record instead.
+            if attempt:
+                raise
+
+
+async def upsert_resumes(resumes, user_email: str, entries: list) -> dict:
+    """Upsert saved batch entries in one bulk write; returns {file_hash: resume_id}"""
+    if not entries:
+        return {}
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"user_email": user_email, "file_hash": entry["file_hash"]},
+            _upsert_update(entry["filename"], entry["file_path"], now),
+            upsert=True,
+        )
+        for entry in entries
+    ]
+    try:
+        await resumes.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        if any(error.get("code") != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+            raise
+        # Lost an insert race with a concurrent upload; the records exist now, so a second pass only updates.
+        await resumes.bulk_write(operations, ordered=False)
+    # bulk_write only reports ids of inserted documents; one query covers both cases.
+    hashes = list({entry["file_hash"] for entry in entries})
+    cursor = resumes.find({"user_email": user_email, "file_hash": {"$in": hashes}}, {"file_hash": 1})
+    return {doc["file_hash"]: doc["_id"] async for doc in cursor}
+
+
+def stored_parse(resume: dict, file_hash: str):
+    """The parse stored on a resume record if it was produced by the current model and prompt"""
+    if resume and resume.get("parsed") is not None and resume.get("parse_key") == make_cache_key(file_hash):
+        return resume["parsed"]
+    return None
+
+
+async def save_parse_result(resumes, user_email: str, file_hash: str, parsed: dict):
+    await resumes.update_one(
+        {"user_email": user_email, "file_hash": file_hash},
+        {"$set": {"parsed": parsed, "parse_key": make_cache_key(file_hash), "parsed_at": datetime.utcnow()}},
+    )
@@ -0,0 +1,102 @@
+import re
+
+# Deterministic extraction of the fields that do not need the LLM.
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Optional country code, optional area code in brackets, then digits with single
+# space/dot/dash separators: +91 98765 43210, (555) 123-4567, +44 20 7946 0958.
+PHONE_RE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,5}\)[\s.-]?)?\d(?:[\s.-]?\d){6,13}(?!\w)")
+YEAR_RANGE_RE = re.compile(r"^(19|20)\d{2}\s*[-.]\s*(19|20)\d{2}$")
+URL_RE = re.compile(
+    r"(?:https?://|www\.)[^\s<>()\"']+|(?:linkedin\.com|github\.com)/[^\s<>()\"']+",
+    re.IGNORECASE,
+)
+MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE_RE = re.compile(
+    rf"\b(?:{MONTHS}\s+(?:19|20)\d{{2}}|(?:0?[1-9]|1[0-2])[/-](?:19|20)\d{{2}}|(?:19|20)\d{{2}})\b"
+    rf"(?:\s*(?:-|–|—|to)\s*(?:{MONTHS}\s+(?:19|20)\d{{2}}|(?:0?[1-9]|1[0-2])[/-](?:19|20)\d{{2}}|(?:19|20)\d{{2}}|present|current|now)\b)?",
+    re.IGNORECASE,
+)
+
+SECTION_ALIASES = {
+    "summary": ("summary", "profile", "professional summary", "objective", "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship"),
+    "education": ("education", "academic background", "academics", "qualifications", "educational qualifications"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "skills & tools", "technologies"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "achievements": ("achievements", "awards", "honors", "accomplishments"),
+    "languages": ("languages",),
+    "references": ("references", "referees"),
+    "hobbies": ("hobbies", "interests", "hobbies and interests", "extracurricular activities"),
+    "personal": ("personal details", "personal information", "declaration"),
+}
+_HEADER_LOOKUP = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+
+def match_section_header(line: str):
+    """Return the canonical section name if `line` is a section header, else None"""
+    key = line.strip().strip(":").strip().lower()
+    if not key or len(key) > 40:
+        return None
+    return _HEADER_LOOKUP.get(key)
+
+
+def _find_phones(text: str) -> list:
+    phones = []
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group().strip()
+        digits = re.sub(r"\D", "", candidate)
+        if not 10 <= len(digits) <= 15 or YEAR_RANGE_RE.match(candidate):
+            continue
+        if candidate not in phones:
+            phones.append(candidate)
+    return phones
+
+
+def _find_links(text: str) -> dict:
+    links = {"linkedin": None, "github": None, "other": []}
+    for match in URL_RE.finditer(text):
+        url = match.group().rstrip(".,;")
+        lowered = url.lower()
+        if "linkedin.com/" in lowered and links["linkedin"] is None:
+            links["linkedin"] = url
+        elif "github.com/" in lowered and links["github"] is None:
+            links["github"] = url
+        elif url not in links["other"]:
+            links["other"].append(url)
+    return links
+
+
+def extract_rule_fields(text: str) -> dict:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    emails = list(dict.fromkeys(EMAIL_RE.findall(text)))
+    phones = _find_phones(text)
+    return {
+        "email": emails[0] if emails else None,
+        "phone": phones[0] if phones else None,
+        "links": _find_links(text),
+        "dates": [match.group() for match in DATE_RE.finditer(text)],
+        "sections": [name for name in map(match_section_header, lines) if name],
+    }
+
+
+# Fields the LLM does not need to produce when the rules found them.
+CONTACT_FIELDS = ("email", "phone")
+
+
+def known_contact_fields(rule_fields: dict) -> list:
+    return [field for field in CONTACT_FIELDS if rule_fields.get(field)]
+
+
+# Rule-only fields the LLM is never asked for, always taken from the pre-extraction.
+RULE_ONLY_FIELDS = ("links", "dates", "sections")
+
+
+def merge_rule_fields(parsed_output: dict, rule_fields: dict) -> dict:
+    """Overlay the deterministic contact fields, links, dates and section headers onto the LLM output"""
+    merged = {field: rule_fields[field] for field in known_contact_fields(rule_fields)}
+    merged.update({key: value for key, value in parsed_output.items() if key not in merged})
+    merged.update({field: rule_fields[field] for field in RULE_ONLY_FIELDS})
+    return merged
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import logging
+from services.ollama_llm import SECTION_TASKS, build_section_prompt, response_format
+from services.json_repair import loads_lenient
+from services.llm_client import get_llm_client
+from services.resume_sections import compact_resume_text, segment_sections
+
+logger = logging.getLogger(__name__)
+
+# "single" sends one prompt per resume; "sectioned" fans out one small prompt per field group.
+LLM_EXTRACTION_MODE = os.getenv("LLM_EXTRACTION_MODE", "single")
+SECTION_LLM_CONCURRENCY = int(os.getenv("SECTION_LLM_CONCURRENCY", "4"))
+# Sectioned mode needs at least this many of the core sections to be detected.
+MIN_DETECTED_SECTIONS = 2
+CORE_SECTIONS = ("skills", "education", "experience")
+RESUME_FIELD_ORDER = ("name", "email", "phone", "skills", "education", "experience", "role")
+
+
+def _group_sections(text: str) -> dict:
+    grouped = {}
+    for name, header, lines in segment_sections(text):
+        block = ([header] if header else []) + lines
+        grouped.setdefault(name, []).extend(block)
+    return grouped
+
+
+async def _run_task(task: str, prompt: str, fields: list, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        raw = await get_llm_client().generate(prompt, **response_format(fields))
+    result = loads_lenient(raw)
+    if not isinstance(result, dict):
+        raise ValueError(f"{task} task returned {type(result).__name__}, expected an object")
+    return result
+
+
+async def extract_by_sections(extracted_text: str, skip_fields=(), concurrency: int = SECTION_LLM_CONCURRENCY):
+    """Run one small prompt per field group concurrently and merge the results.
+
+    Returns None when the resume has too little structure for this mode or any
+    task fails, so the caller can fall back to the single-prompt path.
+    """
+    grouped = _group_sections(compact_resume_text(extracted_text))
+    if sum(1 for name in CORE_SECTIONS if grouped.get(name)) < MIN_DETECTED_SECTIONS:
+        logger.info("Too few sections detected for sectioned extraction, using single prompt")
+        return None
+
+    missing_contact = [field for field in ("name", "email", "phone") if field not in skip_fields]
+    prompts, task_fields = {}, {}
+    for task, (section_names, _) in SECTION_TASKS.items():
+        if task == "contact" and not missing_contact:
+            continue
+        section_text = "\n".join(line for name in section_names for line in grouped.get(name, []))
+        if not section_text:
+            continue
+        prompts[task] = build_section_prompt(task, section_text, fields=missing_contact)
+        task_fields[task] = missing_contact if task == "contact" else [task]
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = list(prompts)
+    results = await asyncio.gather(
+        *(_run_task(task, prompts[task], task_fields[task], semaphore) for task in tasks),
+        return_exceptions=True,
+    )
+
+    merged = {}
+    for task, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Section task '{task}' failed ({result!r}), falling back to single prompt")
+            return None
+        if task == "contact":
+            merged.update({field: result.get(field) for field in missing_contact})
+        else:
+            merged[task] = result.get(task)
+
+    # Same shape as the single-prompt output.
+    output = {}
+    for field in RESUME_FIELD_ORDER:
+        if field in skip_fields:
+            continue
+        default = None if field in ("name", "email", "phone") else []
+        output[field] = merged.get(field, default)
+    return output
@@ -0,0 +1,58 @@
+import re
+
+# Shared clean-up for text coming out of the PDF, DOCX and job-page extractors.
+
+_COMMON_MAP = {
+    # Non-breaking and other fixed-width spaces become plain spaces.
+    **{ch: " " for ch in "\u00a0\u2002\u2003\u2007\u2009\u200a\u202f\u3000"},
+    # Zero-width characters, BOMs and soft hyphens are dropped.
+    **{ch: "" for ch in "\u200b\u200c\u200d\u2060\ufeff\u00ad"},
+    # Typographic ligatures emitted by PDF text layers.
+    "ﬀ": "ff",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬅ": "st",
+    "ﬆ": "st",
+}
+BULLETS = "●•▪◦■□▶►➢✓✔❖◆◇‣⁃∙"
+_BULLET_MAP = {**_COMMON_MAP, **{ch: "" for ch in BULLETS}}
+
+
+def _char_pattern(mapping: dict) -> re.Pattern:
+    return re.compile("[" + re.escape("".join(mapping)) + "]")
+
+
+# Compiled once. Every mapped character is non-ASCII, so pure-ASCII text skips
+# the substitution, and the regex scan only calls back into Python on a match
+# (str.translate with a dict table does a Python lookup per character instead).
+KEEP_BULLETS_RE = _char_pattern(_COMMON_MAP)
+DROP_BULLETS_RE = _char_pattern(_BULLET_MAP)
+# "letter-" at a line end followed by a lower-case continuation: "develop-\nment".
+# Starts with the literal hyphen so the scan can skip ahead to candidates.
+HYPHENATED_BREAK_RE = re.compile(r"-(?<=[A-Za-z]-)[ \r]*\n\s*(?=[a-z])")
+
+
+def _replace_drop_bullets(match: re.Match) -> str:
+    return _BULLET_MAP[match.group()]
+
+
+def _replace_keep_bullets(match: re.Match) -> str:
+    return _COMMON_MAP[match.group()]
+
+
+def normalize_text(text: str, separator: str = "\n", drop_bullets: bool = True, join_hyphenated: bool = True) -> str:
+    """Normalise characters and lines: strip each line, drop blank ones, and
+    optionally re-join words hyphenated across a line break.
+    """
+    if not text:
+        return ""
+    if not text.isascii():
+        if drop_bullets:
+            text = DROP_BULLETS_RE.sub(_replace_drop_bullets, text)
+        else:
+            text = KEEP_BULLETS_RE.sub(_replace_keep_bullets, text)
+    if join_hyphenated and "-" in text:
+        text = HYPHENATED_BREAK_RE.sub("", text)
+    return separator.join(filter(None, map(str.strip, text.splitlines())))
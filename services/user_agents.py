@@ -0,0 +1,29 @@
+import random
+from functools import lru_cache
+from pathlib import Path
+
+USER_AGENTS_FILE = Path(__file__).resolve().parent.parent / "user_agents_list.txt"
+
+DEFAULT_USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_3) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_3 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1"
+]
+
+
+@lru_cache(maxsize=1)
+def load_user_agents() -> list:
+    """Load user agents from file or return defaults; read once per process"""
+    try:
+        if USER_AGENTS_FILE.exists():
+            with open(USER_AGENTS_FILE, 'r', encoding='utf-8') as f:
+                agents = [line.strip() for line in f if line.strip()]
+            if agents:
+                return agents
+    except Exception as e:
+        print(f"User agent load error: {str(e)}")
+    return DEFAULT_USER_AGENTS
+
+
+def random_user_agent() -> str:
+    return random.choice(load_user_agents())
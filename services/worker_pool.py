@@ -0,0 +1,125 @@
+import asyncio
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", os.cpu_count() or 2))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "16"))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "5"))
+
+# Per-stage limits: how many calls may run at once and how many may wait for a slot
+# before new requests are turned away with a 429.
+STAGE_LIMITS = {
+    "extract": (int(os.getenv("EXTRACT_CONCURRENCY", CPU_WORKERS)), int(os.getenv("EXTRACT_QUEUE_SIZE", "32"))),
+    "io": (int(os.getenv("IO_CONCURRENCY", IO_WORKERS)), int(os.getenv("IO_QUEUE_SIZE", "64"))),
+    "llm": (int(os.getenv("LLM_CONCURRENCY", "2")), int(os.getenv("LLM_QUEUE_SIZE", "16"))),
+    "ocr": (int(os.getenv("OCR_CONCURRENCY", CPU_WORKERS)), int(os.getenv("OCR_QUEUE_SIZE", "64"))),
+}
+
+_process_pool = None
+_thread_pool = None
+
+
+class StageFull(HTTPException):
+    def __init__(self, stage_name: str):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Server is busy ({stage_name} queue full). Please retry later.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+
+class Stage:
+    """Bounded concurrency gate for one pipeline stage"""
+
+    def __init__(self, name: str, concurrency: int, max_waiting: int):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_waiting = max(0, max_waiting)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._running = 0
+        self._waiting = 0
+
+    @property
+    def is_full(self) -> bool:
+        return self._running >= self.concurrency and self._waiting >= self.max_waiting
+
+    async def __aenter__(self):
+        if self.is_full:
+            raise StageFull(self.name)
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._running -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "waiting": self._waiting,
+            "concurrency": self.concurrency,
+            "max_waiting": self.max_waiting,
+        }
+
+
+_stages = {}
+
+
+def get_stage(name: str) -> Stage:
+    if name not in _stages:
+        concurrency, max_waiting = STAGE_LIMITS.get(name, (IO_WORKERS, 64))
+        _stages[name] = Stage(name, concurrency, max_waiting)
+    return _stages[name]
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+    return _process_pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io-worker")
+    return _thread_pool
+
+
+async def run_in_process(stage_name: str, fn, *args, **kwargs):
+    """Run a CPU-bound, picklable function in the process pool under a stage limit"""
+    async with get_stage(stage_name):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_process_pool(), partial(fn, *args, **kwargs))
+
+
+async def run_in_thread(stage_name: str, fn, *args, **kwargs):
+    """Run a blocking I/O function in the thread pool under a stage limit"""
+    async with get_stage(stage_name):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_thread_pool(), partial(fn, *args, **kwargs))
+
+
+def pool_stats() -> dict:
+    return {name: stage.stats() for name, stage in _stages.items()}
+
+
+def shutdown_pools():
+    global _process_pool, _thread_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = None
+    logger.info("Worker pools shut down")